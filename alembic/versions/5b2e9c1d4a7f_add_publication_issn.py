@@ -0,0 +1,51 @@
+"""Add Publications.issn and the JournalMatches cache table
+
+Revision ID: 5b2e9c1d4a7f
+Revises: 
+Create Date: 2026-10-17 10:12:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e9c1d4a7f'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created by Base.metadata.create_all() may already be up to date
+    inspector = sa.inspect(op.get_bind())
+    if "JournalMatches" not in inspector.get_table_names():
+        op.create_table(
+            "JournalMatches",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("journal_name", sa.String(), nullable=False),
+            sa.Column("journal_id", sa.Integer(), nullable=True),
+            sa.Column("score", sa.Float(), nullable=True),
+            sa.ForeignKeyConstraint(["journal_id"], ["Journals.id"]),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("journal_name"),
+        )
+        op.create_index("ix_JournalMatches_id", "JournalMatches", ["id"])
+
+    columns = [c["name"] for c in inspector.get_columns("Publications")]
+    if "issn" not in columns:
+        with op.batch_alter_table("Publications") as batch_op:
+            batch_op.add_column(sa.Column("issn", sa.String(), nullable=True))
+            batch_op.create_index("ix_Publications_issn", ["issn"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("Publications") as batch_op:
+        batch_op.drop_index("ix_Publications_issn")
+        batch_op.drop_column("issn")
+    op.drop_index("ix_JournalMatches_id", table_name="JournalMatches")
+    op.drop_table("JournalMatches")
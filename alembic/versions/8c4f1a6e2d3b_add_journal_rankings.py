@@ -0,0 +1,55 @@
+"""Add the JournalRankings table and Publications.abdc_rank_at_publication
+
+Revision ID: 8c4f1a6e2d3b
+Revises: 5b2e9c1d4a7f
+Create Date: 2026-10-17 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4f1a6e2d3b'
+down_revision: Union[str, Sequence[str], None] = '5b2e9c1d4a7f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created by Base.metadata.create_all() may already be up to date
+    inspector = sa.inspect(op.get_bind())
+    if "JournalRankings" not in inspector.get_table_names():
+        op.create_table(
+            "JournalRankings",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("edition", sa.Integer(), nullable=False),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("ISSN", sa.String(), nullable=True),
+            sa.Column("eISSN", sa.String(), nullable=True),
+            sa.Column("abdc_rank", sa.String(), nullable=True),
+            sa.Column("journal_id", sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(["journal_id"], ["Journals.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_JournalRankings_id", "JournalRankings", ["id"])
+        op.create_index("ix_JournalRankings_journal_id_edition", "JournalRankings", ["journal_id", "edition"])
+
+    columns = [c["name"] for c in inspector.get_columns("Publications")]
+    if "abdc_rank_at_publication" not in columns:
+        with op.batch_alter_table("Publications") as batch_op:
+            batch_op.add_column(sa.Column("abdc_rank_at_publication", sa.String(), nullable=True))
+            batch_op.create_index("ix_Publications_abdc_rank_at_publication", ["abdc_rank_at_publication"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("Publications") as batch_op:
+        batch_op.drop_index("ix_Publications_abdc_rank_at_publication")
+        batch_op.drop_column("abdc_rank_at_publication")
+    op.drop_index("ix_JournalRankings_journal_id_edition", table_name="JournalRankings")
+    op.drop_index("ix_JournalRankings_id", table_name="JournalRankings")
+    op.drop_table("JournalRankings")
@@ -0,0 +1,42 @@
+"""Add the ProfileFingerprints table
+
+Revision ID: a4d8e61f09c3
+Revises: f3a9c2e7b810
+Create Date: 2026-10-17 18:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d8e61f09c3'
+down_revision: Union[str, Sequence[str], None] = 'f3a9c2e7b810'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created by Base.metadata.create_all() may already be up to date
+    inspector = sa.inspect(op.get_bind())
+    if "ProfileFingerprints" not in inspector.get_table_names():
+        op.create_table(
+            "ProfileFingerprints",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("university", sa.String(), nullable=False),
+            sa.Column("profile_url", sa.String(), nullable=False),
+            sa.Column("fingerprint", sa.String(), nullable=False),
+            sa.Column("checked_at", sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("university", "profile_url", name="uq_ProfileFingerprints_university_profile_url"),
+        )
+        op.create_index("ix_ProfileFingerprints_id", "ProfileFingerprints", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_ProfileFingerprints_id", table_name="ProfileFingerprints")
+    op.drop_table("ProfileFingerprints")
@@ -0,0 +1,93 @@
+"""Add unique constraints for the write_to_db keys and lookup indexes
+
+Revision ID: d71e0b9a5c42
+Revises: 8c4f1a6e2d3b
+Create Date: 2026-10-17 16:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd71e0b9a5c42'
+down_revision: Union[str, Sequence[str], None] = '8c4f1a6e2d3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def merge_duplicates(bind, table, key_columns, references):
+    """
+    Merges rows of `table` sharing the same non-null key into the row with the
+    lowest id: `references` (table, column) pairs are repointed to that row and
+    the duplicates are deleted, so the unique constraint can be created.
+    """
+    keys = ", ".join(f'"{c}"' for c in key_columns)
+    not_null = " AND ".join(f'"{c}" IS NOT NULL' for c in key_columns)
+    groups = bind.execute(sa.text(
+        f'SELECT {keys}, MIN(id) FROM "{table}" WHERE {not_null} GROUP BY {keys} HAVING COUNT(*) > 1'
+    )).fetchall()
+    matches = " AND ".join(f'"{c}" = :k{i}' for i, c in enumerate(key_columns))
+    for *key, keep_id in groups:
+        params = {f"k{i}": value for i, value in enumerate(key)}
+        params["keep_id"] = keep_id
+        duplicate_ids = [row[0] for row in bind.execute(
+            sa.text(f'SELECT id FROM "{table}" WHERE {matches} AND id != :keep_id'), params
+        )]
+        for duplicate_id in duplicate_ids:
+            for ref_table, ref_column in references:
+                # OR IGNORE skips links the kept row already has; the leftovers are deleted below
+                bind.execute(sa.text(
+                    f'UPDATE OR IGNORE "{ref_table}" SET "{ref_column}" = :keep_id WHERE "{ref_column}" = :duplicate_id'
+                ), {"keep_id": keep_id, "duplicate_id": duplicate_id})
+                bind.execute(sa.text(
+                    f'DELETE FROM "{ref_table}" WHERE "{ref_column}" = :duplicate_id'
+                ), {"duplicate_id": duplicate_id})
+            bind.execute(sa.text(f'DELETE FROM "{table}" WHERE id = :duplicate_id'), {"duplicate_id": duplicate_id})
+    return len(groups)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created by Base.metadata.create_all() may already be up to date
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    def has_unique(table, name):
+        return name in [c["name"] for c in inspector.get_unique_constraints(table)]
+
+    def has_index(table, name):
+        return name in [i["name"] for i in inspector.get_indexes(table)]
+
+    if not has_unique("Researchers", "uq_Researchers_name_profile_url"):
+        merge_duplicates(bind, "Researchers", ["name", "profile_url"], [
+            ("Researcher_Publication", "researcher_id"),
+            ("Publications", "researcher_id"),
+        ])
+        with op.batch_alter_table("Researchers") as batch_op:
+            batch_op.create_unique_constraint("uq_Researchers_name_profile_url", ["name", "profile_url"])
+
+    if not has_unique("Publications", "uq_Publications_title_researcher_id"):
+        merge_duplicates(bind, "Publications", ["title", "researcher_id"], [
+            ("Researcher_Publication", "publication_id"),
+        ])
+        with op.batch_alter_table("Publications") as batch_op:
+            batch_op.create_unique_constraint("uq_Publications_title_researcher_id", ["title", "researcher_id"])
+
+    for table, column in [("Publications", "researcher_id"), ("Publications", "journal_id"), ("Journals", "ISSN"), ("Journals", "eISSN")]:
+        if not has_index(table, f"ix_{table}_{column}"):
+            op.create_index(f"ix_{table}_{column}", table, [column])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_Journals_eISSN", table_name="Journals")
+    op.drop_index("ix_Journals_ISSN", table_name="Journals")
+    op.drop_index("ix_Publications_journal_id", table_name="Publications")
+    op.drop_index("ix_Publications_researcher_id", table_name="Publications")
+    with op.batch_alter_table("Publications") as batch_op:
+        batch_op.drop_constraint("uq_Publications_title_researcher_id", type_="unique")
+    with op.batch_alter_table("Researchers") as batch_op:
+        batch_op.drop_constraint("uq_Researchers_name_profile_url", type_="unique")
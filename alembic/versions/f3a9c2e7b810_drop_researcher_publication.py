@@ -0,0 +1,52 @@
+"""Drop the Researcher_Publication association table
+
+Publications.researcher_id is the canonical researcher link; the association
+table only ever repeated it.
+
+Revision ID: f3a9c2e7b810
+Revises: d71e0b9a5c42
+Create Date: 2026-10-17 17:25:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c2e7b810'
+down_revision: Union[str, Sequence[str], None] = 'd71e0b9a5c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if "Researcher_Publication" not in sa.inspect(bind).get_table_names():
+        return
+    extra = bind.execute(sa.text(
+        'SELECT COUNT(*) FROM "Researcher_Publication" l '
+        'LEFT JOIN "Publications" p ON p.id = l.publication_id AND p.researcher_id = l.researcher_id '
+        'WHERE p.id IS NULL'
+    )).scalar()
+    if extra:
+        print(f"Dropping {extra} Researcher_Publication links not matching Publications.researcher_id")
+    op.drop_table("Researcher_Publication")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table(
+        "Researcher_Publication",
+        sa.Column("researcher_id", sa.Integer(), nullable=False),
+        sa.Column("publication_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["publication_id"], ["Publications.id"]),
+        sa.ForeignKeyConstraint(["researcher_id"], ["Researchers.id"]),
+        sa.PrimaryKeyConstraint("researcher_id", "publication_id"),
+    )
+    op.execute(
+        'INSERT INTO "Researcher_Publication" (researcher_id, publication_id) '
+        'SELECT researcher_id, id FROM "Publications" WHERE researcher_id IS NOT NULL'
+    )
@@ -1,8 +1,11 @@
 from fastapi.responses import RedirectResponse, FileResponse
 from starlette.responses import StreamingResponse
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
-from app.models import Researchers, Publications, Journals
+from app.models import Researchers, Publications, Journals, JournalMatches
+from app.scrapers.helpers.util import invalidate_journal_match_cache, normalize_issn, link_journal_rankings, update_publication_ranks
+from app.scrapers.helpers.fingerprints import clear_fingerprints
 from pathlib import Path
 
 import pandas as pd
@@ -256,28 +259,92 @@ def download_publications_template():
     return StreamingResponse(csv_iter(), media_type="text/csv", headers=headers)
 
 def replace_ABDC_rankings(file_path="app/files/uploads_current/ABDC_upload.csv"):
+    """
+    Replaces the Journals table with the ABDC rankings in the uploaded CSV.
+    Journals are updated in place by title so unchanged titles keep their ids.
+    A new title sharing an ISSN/eISSN with a title that left the list is treated
+    as a rename of that journal; other missing titles are removed and new ones added.
+    Only publications whose match was removed or renamed, or whose cached match
+    moved to a new title, are reset so the next match_journals() run rematches them.
+    Returns a summary dict of the changes.
+    """
     df = pd.read_csv(file_path)
     # Strip whitespace from column names and values
     df.columns = [col.strip() for col in df.columns]
 
     session = SessionLocal()
     try:
-        # Remove all existing data from Journals table
-        session.query(Journals).delete()
-        session.commit()
-        # Add new data
+        rows = []
         for _, row in df.iterrows():
-            journal = Journals(
-                name=row['Journal Title'],
+            rows.append((row['Journal Title'], dict(
                 abdc_rank=row['Rating'],
                 publisher=row['Publisher'],
                 ISSN=row['ISSN'],
                 eISSN=row['ISSN Online'],
                 FoR=row['FoR'],
                 year_of_inception=row['Year Inception']
-            )
-            session.add(journal)
+            )))
+        titles = {name for name, _ in rows}
+
+        existing = {j.name: j for j in session.query(Journals).all()}
+        old_ids = {name: j.id for name, j in existing.items()}
+        # Journals whose title is no longer on the list, by ISSN, to detect renames
+        gone_by_issn = {}
+        for name, journal in existing.items():
+            if name not in titles:
+                for issn in (normalize_issn(journal.ISSN), normalize_issn(journal.eISSN)):
+                    if issn:
+                        gone_by_issn.setdefault(issn, journal)
+
+        kept_ids = set()
+        added = []
+        renamed = []
+        for name, values in rows:
+            journal = existing.get(name)
+            if journal is None:
+                for issn in (normalize_issn(values['ISSN']), normalize_issn(values['eISSN'])):
+                    candidate = gone_by_issn.get(issn) if issn else None
+                    if candidate is not None and candidate.id not in kept_ids:
+                        journal = candidate
+                        journal.name = name
+                        renamed.append(journal)
+                        break
+            if journal is None:
+                journal = Journals(name=name, **values)
+                session.add(journal)
+                added.append(journal)
+            else:
+                for key, value in values.items():
+                    setattr(journal, key, value)
+                kept_ids.add(journal.id)
+            existing[name] = journal
+
+        # Remove journals that are no longer on the list
+        removed_ids = [journal_id for journal_id in old_ids.values() if journal_id not in kept_ids]
+        if removed_ids:
+            session.query(Journals).filter(Journals.id.in_(removed_ids)).delete(synchronize_session=False)
+        session.flush()
+        renamed_ids = [j.id for j in renamed]
+        print(f"ABDC rankings: {len(added)} added, {len(renamed)} renamed, {len(removed_ids)} removed")
+
+        changed_names = invalidate_journal_match_cache(
+            session,
+            removed_ids + renamed_ids,
+            [(j.id, j.name) for j in added + renamed]
+        )
+        # Reset only the publications whose current match is affected by the change
+        reset_filter = Publications.journal_id.in_(removed_ids + renamed_ids)
+        if changed_names:
+            reset_filter = or_(reset_filter, Publications.journal_name.in_(changed_names))
+        reset = session.query(Publications).filter(reset_filter).update(
+            {Publications.journal_id: None, Publications.abdc_rank_at_publication: None}, synchronize_session=False
+        )
+        # Historical editions follow renamed journals; fallback ranks follow the new list
+        link_journal_rankings(session)
+        update_publication_ranks(session)
         session.commit()
+        print(f"Reset journal matches for {reset} publications")
+        return {"added": len(added), "renamed": len(renamed), "removed": len(removed_ids), "reset_publications": reset}
     finally:
         session.close()
 
@@ -337,6 +404,7 @@ def update_researchers(file_path="app/files/uploads_current/researchers_upload.c
     session = SessionLocal()
     try:
         session.query(Researchers).delete()
+        clear_fingerprints(session)  # Otherwise the next scrape skips the removed researchers as unchanged
         session.commit()
         for _, row in df.iterrows():
             researcher = Researchers(
@@ -374,6 +442,7 @@ def update_publications(file_path="app/files/uploads_current/publications_upload
     session = SessionLocal()
     try:
         session.query(Publications).delete()
+        clear_fingerprints(session)  # Otherwise the next scrape skips the removed publications' profiles as unchanged
         session.commit()
         for _, row in df.iterrows():
             pub = Publications(
@@ -387,6 +456,8 @@ def update_publications(file_path="app/files/uploads_current/publications_upload
                 journal_id=int(row["Journal ID"]) if str(row["Journal ID"]).strip() else None
             )
             session.add(pub)
+        session.flush()
+        update_publication_ranks(session)
         session.commit()
     finally:
         session.close()
@@ -440,7 +511,9 @@ def reupload_master_spreadsheet(file_path="app/files/uploads_current/master_spre
         # Remove all existing data
         session.query(Publications).delete()
         session.query(Researchers).delete()
+        session.query(JournalMatches).delete()  # Journal ids are replaced, so cached matches are stale
         session.query(Journals).delete()
+        clear_fingerprints(session)  # Researchers and publications are replaced, so no profile is unchanged
         session.commit()
 
         # Insert Journals
@@ -500,6 +573,10 @@ def reupload_master_spreadsheet(file_path="app/files/uploads_current/master_spre
                 journal_id=int(row['journal_id']) if row['journal_id'] else None
             )
             session.add(pub)
+        session.flush()
+        # Journal ids are replaced, so relink the historical rankings
+        link_journal_rankings(session)
+        update_publication_ranks(session)
         session.commit()
     finally:
         session.close()
@@ -27,6 +27,7 @@ def get_researcher_profile(researcher_id):
                     "journal": journal.name if journal else pub.journal_name,
                     "year": pub.year,
                     "ranking": journal.abdc_rank if journal else "",
+                    "ranking_at_publication": pub.abdc_rank_at_publication or "",
                     "num_authors": pub.num_authors,
                 }
             )
@@ -3,6 +3,21 @@ from app.database import SessionLocal
 from app.models import Researchers, Publications, Journals
 import math
 
+# Stats that depend on which ABDC rank is used, see get_rank_basis
+RANK_STATS = ["abdc_articles", "abdc_a_star_a", "num_a", "num_a_star"]
+
+def get_rank_basis(request):
+    """Returns "publication" to use the ABDC rank at time of publication, otherwise "current"."""
+    return "publication" if request.query_params.get("rank_basis") == "publication" else "current"
+
+def count_ranks(ranks):
+    return {
+        "abdc_articles": sum(1 for rank in ranks if rank),
+        "abdc_a_star_a": sum(1 for rank in ranks if rank in ["A*", "A"]),
+        "num_a": sum(1 for rank in ranks if rank == "A"),
+        "num_a_star": sum(1 for rank in ranks if rank == "A*"),
+    }
+
 def filter_researchers(request, researcher_list):
     field = request.query_params.get("field", "")
     level = request.query_params.get("level", "")
@@ -35,24 +50,15 @@ def get_researcher_data(request: Request, RESEARCHER_STATS_CACHE):
             for r in researchers:
                 pubs = pubs_by_researcher.get(r.id, [])
                 total_articles = len(pubs)
-                abdc_articles = 0
-                abdc_a_star_a = 0
-                num_a = 0
-                num_a_star = 0
+                current_ranks = []
+                ranks_at_publication = [pub.abdc_rank_at_publication for pub in pubs]
                 jif_list = []
                 jif5_list = []
                 citation_list = []
                 for pub in pubs:
                     journal = journals.get(pub.journal_id)
                     if journal:
-                        if journal.abdc_rank:
-                            abdc_articles += 1
-                        if journal.abdc_rank in ["A*", "A"]:
-                            abdc_a_star_a += 1
-                        if journal.abdc_rank == "A":
-                            num_a += 1
-                        if journal.abdc_rank == "A*":
-                            num_a_star += 1
+                        current_ranks.append(journal.abdc_rank)
                         if journal.JIF is not None:
                             jif_list.append(journal.JIF)
                         if journal.JIF_5_year is not None:
@@ -69,10 +75,8 @@ def get_researcher_data(request: Request, RESEARCHER_STATS_CACHE):
                     "level": r.level,
                     "university": r.university,
                     "total_articles": total_articles,
-                    "abdc_articles": abdc_articles,
-                    "abdc_a_star_a": abdc_a_star_a,
-                    "num_a": num_a,
-                    "num_a_star": num_a_star,
+                    **count_ranks(current_ranks),
+                    **{f"{key}_at_publication": value for key, value in count_ranks(ranks_at_publication).items()},
                     "avg_jif": avg_jif,
                     "avg_jif5": avg_jif5,
                     "avg_citation": avg_citation,
@@ -84,6 +88,10 @@ def get_researcher_data(request: Request, RESEARCHER_STATS_CACHE):
         researcher_list = RESEARCHER_STATS_CACHE
 
     researcher_list = filter_researchers(request, researcher_list)
+    if get_rank_basis(request) == "publication":
+        researcher_list = [
+            {**r, **{key: r[f"{key}_at_publication"] for key in RANK_STATS}} for r in researcher_list
+        ]
 
     # Add variable_value and variable_label for the selected stat
     if sort_by == "total_articles":
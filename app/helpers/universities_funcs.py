@@ -1,6 +1,10 @@
 from fastapi import Request
 from app.database import SessionLocal
 from app.models import Researchers, Publications, Journals
+from app.helpers.researchers_funcs import get_rank_basis
+
+# Stats that depend on which ABDC rank is used, see get_rank_basis
+RANK_STATS = ["abdc_a_star_a", "accounting_a_star_a_articles", "finance_a_star_a_articles"]
 
 def get_university_data(request: Request, UNIVERSITY_STATS_CACHE):
     sort_by = request.query_params.get("sort_by", "total_researchers")
@@ -24,6 +28,7 @@ def get_university_data(request: Request, UNIVERSITY_STATS_CACHE):
                         "accounting_articles": 0,
                         "finance_articles": 0,
                         "abdc_a_star_a": 0,
+                        "abdc_a_star_a_at_publication": 0,
                         "jif_list": [],
                         "jif5_list": [],
                     }
@@ -43,6 +48,14 @@ def get_university_data(request: Request, UNIVERSITY_STATS_CACHE):
                     universities[uni]["accounting_articles"] += 1
                 elif researcher.field == "Finance":
                     universities[uni]["finance_articles"] += 1
+                if pub.abdc_rank_at_publication in ["A*", "A"]:
+                    universities[uni]["abdc_a_star_a_at_publication"] += 1
+                    if researcher.field == "Accounting":
+                        universities[uni].setdefault("accounting_a_star_a_articles_at_publication", 0)
+                        universities[uni]["accounting_a_star_a_articles_at_publication"] += 1
+                    elif researcher.field == "Finance":
+                        universities[uni].setdefault("finance_a_star_a_articles_at_publication", 0)
+                        universities[uni]["finance_a_star_a_articles_at_publication"] += 1
                 journal = journals.get(pub.journal_id)
                 if journal:
                     if journal.abdc_rank in ["A*", "A"]:
@@ -102,6 +115,9 @@ def get_university_data(request: Request, UNIVERSITY_STATS_CACHE):
                     "abdc_a_star_a": stats["abdc_a_star_a"],
                     "accounting_a_star_a_articles": accounting_a_star_a,
                     "finance_a_star_a_articles": finance_a_star_a,
+                    "abdc_a_star_a_at_publication": stats["abdc_a_star_a_at_publication"],
+                    "accounting_a_star_a_articles_at_publication": stats.get("accounting_a_star_a_articles_at_publication", 0),
+                    "finance_a_star_a_articles_at_publication": stats.get("finance_a_star_a_articles_at_publication", 0),
                     "avg_jif": avg_jif,
                     "avg_jif_accounting": avg_jif_accounting,
                     "avg_jif_finance": avg_jif_finance,
@@ -118,6 +134,11 @@ def get_university_data(request: Request, UNIVERSITY_STATS_CACHE):
     else:
         university_list = UNIVERSITY_STATS_CACHE
 
+    if get_rank_basis(request) == "publication":
+        university_list = [
+            {**u, **{key: u[f"{key}_at_publication"] for key in RANK_STATS}} for u in university_list
+        ]
+
     # Add variable_value and variable_label for the selected stat
     if sort_by == "total_researchers":
         variable_label = "Total Researchers"
@@ -1,17 +1,11 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.database import Base
 
-# Association table for many-to-many relationship between Researcher and Publications
-Researcher_Publication = Table(
-    "Researcher_Publication",
-    Base.metadata,
-    Column("researcher_id", Integer, ForeignKey("Researchers.id"), primary_key=True),
-    Column("publication_id", Integer, ForeignKey("Publications.id"), primary_key=True)
-)
-
 class Researchers(Base):
     __tablename__ = "Researchers"
+    # write_to_db identifies researchers by name and profile URL
+    __table_args__ = (UniqueConstraint("name", "profile_url", name="uq_Researchers_name_profile_url"),)
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     university = Column(String, nullable=False)
@@ -19,11 +13,8 @@ class Researchers(Base):
     job_title = Column(String, nullable=True)
     level = Column(String, nullable=True)
     field = Column(String, nullable=True)
-    publication = relationship(
-        "Publications",
-        secondary="Researcher_Publication",
-        back_populates="researcher"
-    )
+    # Publications.researcher_id is the only link between researchers and publications
+    publication = relationship("Publications", back_populates="researcher")
 
 class Journals(Base):
     __tablename__ = "Journals"
@@ -33,8 +24,8 @@ class Journals(Base):
     JIF = Column(Float, nullable=True)
     JIF_5_year = Column(Float, nullable=True)
     citation_percentage = Column(Float, nullable=True)
-    ISSN = Column(String, nullable=True)
-    eISSN = Column(String, nullable=True)
+    ISSN = Column(String, nullable=True, index=True)
+    eISSN = Column(String, nullable=True, index=True)
     publisher = Column(String, nullable=True)
     FoR = Column(Integer, nullable=True)
     year_of_inception = Column(Integer, nullable=True)
@@ -42,22 +33,55 @@ class Journals(Base):
 
 class Publications(Base):
     __tablename__ = "Publications"
+    # write_to_db identifies publications by title and researcher
+    __table_args__ = (UniqueConstraint("title", "researcher_id", name="uq_Publications_title_researcher_id"),)
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     year = Column(Integer, nullable=True)
     publication_type = Column(String, nullable=True)
     publication_url = Column(String, nullable=True)
     journal_name = Column(String, nullable=True)
+    issn = Column(String, nullable=True, index=True)
+    abdc_rank_at_publication = Column(String, nullable=True, index=True)
     num_authors = Column(Integer, nullable=True)
-    researcher_id = Column(Integer, ForeignKey("Researchers.id"), nullable=False)
-    journal_id = Column(Integer, ForeignKey("Journals.id"), nullable=True)
-    researcher = relationship(
-        "Researchers",
-        secondary="Researcher_Publication",
-        back_populates="publication"
-    )
+    researcher_id = Column(Integer, ForeignKey("Researchers.id"), nullable=False, index=True)
+    journal_id = Column(Integer, ForeignKey("Journals.id"), nullable=True, index=True)
+    researcher = relationship("Researchers", back_populates="publication")
     journal = relationship("Journals", back_populates="publication")
 
+class JournalMatches(Base):
+    # Cache of fuzzy journal name matches, reused across scraper runs and uploads.
+    # Stores the best scoring journal for each scraped name regardless of threshold.
+    __tablename__ = "JournalMatches"
+    id = Column(Integer, primary_key=True, index=True)
+    journal_name = Column(String, unique=True, nullable=False)
+    journal_id = Column(Integer, ForeignKey("Journals.id"), nullable=True)
+    score = Column(Float, nullable=True)
+
+class JournalRankings(Base):
+    # ABDC rank of each journal in every JQL edition, used for the rank at time of publication.
+    # journal_id links the edition's entry to the current Journals row where one can be found.
+    __tablename__ = "JournalRankings"
+    __table_args__ = (Index("ix_JournalRankings_journal_id_edition", "journal_id", "edition"),)
+    id = Column(Integer, primary_key=True, index=True)
+    edition = Column(Integer, nullable=False)
+    title = Column(String, nullable=False)
+    ISSN = Column(String, nullable=True)
+    eISSN = Column(String, nullable=True)
+    abdc_rank = Column(String, nullable=True)
+    journal_id = Column(Integer, ForeignKey("Journals.id"), nullable=True)
+
+class ProfileFingerprints(Base):
+    # Fingerprint of each researcher profile as last written to the database, so unchanged
+    # profiles can be skipped by the next scrape. checked_at is a Unix timestamp.
+    __tablename__ = "ProfileFingerprints"
+    __table_args__ = (UniqueConstraint("university", "profile_url", name="uq_ProfileFingerprints_university_profile_url"),)
+    id = Column(Integer, primary_key=True, index=True)
+    university = Column(String, nullable=False)
+    profile_url = Column(String, nullable=False)
+    fingerprint = Column(String, nullable=False)
+    checked_at = Column(Float, nullable=False)
+
 class Users(Base):
     __tablename__ = "Users"
     id = Column(Integer, primary_key=True, index=True)
@@ -5,7 +5,7 @@ from contextlib import redirect_stdout
 from app.scrapers.update import update_all
 from app.scrapers.helpers.util import match_journals
 from app.scripts.CSV_imports import print_issns_in_batches
-from app.helpers.researchers_funcs import get_researcher_data
+from app.helpers.researchers_funcs import get_researcher_data, get_rank_basis
 from app.helpers.researcher_profile_funcs import get_researcher_profile
 from app.helpers.universities_funcs import get_university_data
 from app.helpers.admin_funcs import (
@@ -35,7 +35,7 @@ templates = Jinja2Templates(directory="app/templates")
 
 # --- New Global State Variable with 'logs' key ---
 # This dictionary now holds logs in addition to progress and messages.
-scraper_status_data = {"progress": 0, "message": "Not started", "logs": []}
+scraper_status_data = {"progress": 0, "message": "Not started", "logs": [], "universities": {}}
 RESEARCHER_STATS_CACHE = None
 UNIVERSITY_STATS_CACHE = None
 
@@ -116,6 +116,9 @@ def researcher_profile(request: Request, researcher_id: int = Path(...)):
     values = request.query_params.getlist("abdc_only")
     param = values[-1] if values else None
     abdc_only = True if param is None else (param.lower() == "true")
+    rank_basis = get_rank_basis(request)
+    if rank_basis == "publication":
+        pub_list = [{**pub, "ranking": pub["ranking_at_publication"]} for pub in pub_list]
         
     if abdc_only:
         # Only include articles with a non-empty ABDC ranking
@@ -127,7 +130,8 @@ def researcher_profile(request: Request, researcher_id: int = Path(...)):
             "request": request,
             "researcher": researcher_data,
             "publications": pub_list,
-            "abdc_only": abdc_only  
+            "abdc_only": abdc_only,
+            "rank_basis": rank_basis
         }
     )
 
@@ -350,7 +354,7 @@ async def upload_abdc(
         import_clarivate("/app/files/uploads_current/clarivate_upload.csv")  # Re-import all JIF data to refresh journal matches
     except Exception as e:
         request.session["flash"] += f"No clarivate data found, please upload clarivate data as well."
-    match_journals(force=True)  # Re-match journals after ABDC update
+    match_journals()  # Re-match only the publications reset by the ABDC update
     global RESEARCHER_STATS_CACHE, UNIVERSITY_STATS_CACHE
     RESEARCHER_STATS_CACHE = None  # Clear researcher cache to reflect updated journal data
     UNIVERSITY_STATS_CACHE = None  # Clear university cache to reflect updated journal data
@@ -474,7 +478,7 @@ class FrontendLogHandler(io.StringIO):
         sys.__stdout__.write(s)
         sys.__stdout__.flush()
 
-def run_scraper_task():
+def run_scraper_task(match_workers=None, scraper_workers=1):
     """
     This function runs in a separate thread and uses the FrontendLogHandler
     to capture all print outputs.
@@ -483,13 +487,19 @@ def run_scraper_task():
     scraper_status_data['progress'] = 0
     scraper_status_data['message'] = 'Scraping started...'
     scraper_status_data['logs'] = [] # Reset logs for a new run
+    scraper_status_data['universities'] = {}
     
     log_capture = FrontendLogHandler()
     
     try:
         # Redirect all standard output within this block to our handler
         with redirect_stdout(log_capture):
-            update_all(progress_callback=update_progress)
+            update_all(
+                progress_callback=update_progress,
+                match_workers=match_workers,
+                scraper_workers=scraper_workers,
+                status_callback=update_university_status
+            )
         
         if scraper_status_data.get('progress') != -1:
              scraper_status_data['message'] = 'Completed successfully!'
@@ -506,6 +516,11 @@ def update_progress(progress):
     global scraper_status_data
     scraper_status_data['progress'] = progress
 
+def update_university_status(university, status, progress):
+    """Callback function to record one university's stage and write progress."""
+    global scraper_status_data
+    scraper_status_data['universities'][university] = {"status": status, "progress": progress}
+
 @router.post("/admin/run-scraper")
 async def run_scraper(request: Request):
     """Endpoint to start the scraper thread."""
@@ -516,10 +531,20 @@ async def run_scraper(request: Request):
     if any("run_scraper_task" in t.name for t in threading.enumerate()):
         return JSONResponse(content={"message": "Scraper is already running."}, status_code=409)
 
+    form = await request.form()
+    try:
+        match_workers = max(1, int(form.get("match_workers") or 1))
+    except ValueError:
+        match_workers = 1
+    try:
+        scraper_workers = max(1, int(form.get("scraper_workers") or 1))
+    except ValueError:
+        scraper_workers = 1
+
     global scraper_status_data
-    scraper_status_data = {"progress": 0, "message": "Not started", "logs": []}
+    scraper_status_data = {"progress": 0, "message": "Not started", "logs": [], "universities": {}}
     
-    thread = threading.Thread(target=run_scraper_task, name="run_scraper_task")
+    thread = threading.Thread(target=run_scraper_task, args=(match_workers, scraper_workers), name="run_scraper_task")
     thread.start()
     
     return JSONResponse(content={"message": "Scraper started"})
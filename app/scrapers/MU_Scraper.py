@@ -1,40 +1,42 @@
-import undetected_chromedriver as uc
-from app.scrapers.helpers.big3_functions import scrape_publications, find_profile_urls
+from app.scrapers.helpers.driver_pool import driver_session
+from app.scrapers.helpers.big3_functions import scrape_profiles, find_profile_urls
+from app.scrapers.helpers.fingerprints import FingerprintTracker
+from app.scrapers.helpers.checkpoints import ScrapeCheckpoint
 import csv
 
 def scrape_MU():
-    options = uc.ChromeOptions()
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--window-size=1280,800")
-    options.add_argument("--lang=en-US,en")
-    # options.add_argument("--headless")  # Uncomment for headless mode
-    driver = uc.Chrome(options=options)
+    # Pages are fetched over HTTP, so Chrome only starts if a page needs it
+    with driver_session(lazy=True) as driver:
 
-    profiles_urls = [
-        ("https://research.monash.edu/en/organisations/department-of-accounting/persons/", "Accounting"),
-        ("https://research.monash.edu/en/organisations/banking-finance/persons/", "Finance"),
-        ("https://research.monash.edu/en/organisations/centre-for-quantitative-finance-and-investment-strategies/persons/", "Finance")
-    ]
-    base = "https://research.monash.edu"
-    pairs = []
-    for url, field in profiles_urls:
-        print(f"Finding profile URLs on: {url}")
-        found = find_profile_urls(url, base, driver)  # returns list[str]
-        pairs.extend((u, field) for u in found)
-    profile_urls = list(set(pairs))
-    print(f"Found {len(profile_urls)} profile URLs")
+        profiles_urls = [
+            ("https://research.monash.edu/en/organisations/department-of-accounting/persons/", "Accounting"),
+            ("https://research.monash.edu/en/organisations/banking-finance/persons/", "Finance"),
+            ("https://research.monash.edu/en/organisations/centre-for-quantitative-finance-and-investment-strategies/persons/", "Finance")
+        ]
+        base = "https://research.monash.edu"
+        # Writes the CSV header, or picks up after the last profile an interrupted run wrote
+        checkpoint = ScrapeCheckpoint("MU").start()
+        pairs = []
+        for url, field in profiles_urls:
+            print(f"Finding profile URLs on: {url}")
+            found = checkpoint.listing(url, lambda: find_profile_urls(url, base, driver))  # returns list[str]
+            pairs.extend((u, field) for u in found)
+        profile_urls = checkpoint.listing("profiles", lambda: list(set(pairs)))
+        print(f"Found {len(profile_urls)} profile URLs")
+        remaining = [(url, field) for url, field in profile_urls if not checkpoint.done(f"{url}#{field}")]
 
-    csv_header = ["Title", "Year", "Type", "Journal Name", "Article URL", "Researcher Name", "Profile URL", "Job Title", "Field"]
-    with open("app/files/temp/MU_data.csv", mode="w", newline='', encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(csv_header)
+        def write_profile(profile_url, field, name, job_title, publications_info):
+            if publications_info is not None:
+                print(f"Scraped profile: {profile_url} ({field})")
+                print(f"Found {len(publications_info)} publications in {profile_url}")
+                with open("app/files/temp/MU_data.csv", mode="a", newline='', encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    for line in publications_info:
+                        writer.writerow(line + [name, profile_url, job_title, field])  # Append fields
+            checkpoint.mark_done(f"{profile_url}#{field}")
 
-    for profile_url, field in profile_urls:
-        print(f"Scraping profile: {profile_url} ({field})")
-        name, job_title, publications_info = scrape_publications(profile_url, driver)
-        print(f"Found {len(publications_info)} publications in {profile_url}")
-        for line in publications_info:
-            with open("app/files/temp/MU_data.csv", mode="a", newline='', encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(line + [name, profile_url, job_title, field])  # Append fields
\ No newline at end of file
+        # Profiles are fetched concurrently; rows are still written in profile order
+        tracker = FingerprintTracker("MU", resume=checkpoint.resumed)
+        scrape_profiles(remaining, driver, write_profile, tracker=tracker)
+        print(f"Skipped {tracker.skipped} unchanged profiles")
+        checkpoint.finish()
@@ -3,10 +3,12 @@ import re
 from typing import List, Dict, Optional, Tuple
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
-import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from app.scrapers.helpers.driver_pool import driver_session
+from app.scrapers.helpers.page_cache import get_page_cache, cached_page
+from app.scrapers.helpers.checkpoints import ScrapeCheckpoint
 import csv
 
 # ========= CONFIG =========
@@ -22,16 +24,6 @@ SCROLL_STEPS = 5
 SCROLL_PAUSE = 0.7
 # =========================
 
-def make_driver(headless: bool = False):
-    opts = uc.ChromeOptions()
-    if headless:
-        opts.add_argument("--headless=new")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--window-size=1280,1100")
-    opts.add_argument("--lang=en-US,en")
-    return uc.Chrome(options=opts)
-
 def wait_for_body(driver, timeout: int):
     WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
 
@@ -190,35 +182,60 @@ def parse_researcher_profile(html: str, profile_url : str):
     return publications
 
 def scrape_UA(headless: bool = False):
-    driver = make_driver(headless=headless)
-    try:
-        entry_pairs = collect_entry_links(STAFF_INDEX_PAGES_WITH_FIELDS, driver)
-        profile_pairs_set: set[Tuple[str, str]] = set()
-        for entry_url, field in entry_pairs:
-            resolved = resolve_to_profile(driver, entry_url, field)
-            if resolved:
-                profile_pairs_set.add((resolved[0].rstrip("/"), resolved[1]))
-            else:
-                print("  ! No researcher profile found:", entry_url)
-        profile_pairs = list(profile_pairs_set)
+    if get_page_cache().replaying:
+        return replay_UA()
+    with driver_session(headless=headless) as driver:
+        # Writes the CSV header, or picks up after the last profile an interrupted run wrote
+        checkpoint = ScrapeCheckpoint("UA").start()
+
+        def find_profiles():
+            entry_pairs = collect_entry_links(STAFF_INDEX_PAGES_WITH_FIELDS, driver)
+            profile_pairs_set: set[Tuple[str, str]] = set()
+            for entry_url, field in entry_pairs:
+                resolved = resolve_to_profile(driver, entry_url, field)
+                if resolved:
+                    profile_pairs_set.add((resolved[0].rstrip("/"), resolved[1]))
+                else:
+                    print("  ! No researcher profile found:", entry_url)
+            return list(profile_pairs_set)
+
+        profile_pairs = checkpoint.listing("profiles", find_profiles)
         print(f"Resolved {len(profile_pairs)} researcher profile URLs (with fields).")
-        csv_header = ["Title", "Year", "Type", "Journal Name", "Article URL", "Researcher Name", "Profile URL", "Job Title", "Field"]
-        with open("app/files/temp/UA_data.csv", mode="w", newline='', encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(csv_header)
 
         for i, (profile_url, field) in enumerate(profile_pairs, 1):
+            if checkpoint.done(f"{profile_url}#{field}"):
+                continue
             print(f"[{i}/{len(profile_pairs)}] {profile_url} ({field})")
-            html = open_publications_journals(driver, profile_url)
-            publications = parse_researcher_profile(html, profile_url)
-            for row in publications:
-                with open("app/files/temp/UA_data.csv", mode="a", newline='', encoding="utf-8") as f:
-                    writer = csv.writer(f)
-                    writer.writerow(row + [field])  # append field as a separate field
-
-            time.sleep(POLITE_DELAY)
-    finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
\ No newline at end of file
+            html = cached_page(
+                f"{profile_url}#{field}",
+                lambda: fetch_profile(driver, profile_url),
+                namespace="UA",
+                meta={"profile_url": profile_url, "field": field}
+            )
+            write_profile_rows(html, profile_url, field)
+            checkpoint.mark_done(f"{profile_url}#{field}")
+        checkpoint.finish()
+
+def fetch_profile(driver, profile_url: str) -> str:
+    html = open_publications_journals(driver, profile_url)
+    time.sleep(POLITE_DELAY)
+    return html
+
+def write_profile_rows(html: str, profile_url: str, field: str):
+    publications = parse_researcher_profile(html, profile_url)
+    with open("app/files/temp/UA_data.csv", mode="a", newline='', encoding="utf-8") as f:
+        writer = csv.writer(f)
+        for row in publications:
+            writer.writerow(row + [field])  # append field as a separate field
+
+def replay_UA():
+    """Re-parses every cached UA profile into UA_data.csv without opening a browser."""
+    csv_header = ["Title", "Year", "Type", "Journal Name", "Article URL", "Researcher Name", "Profile URL", "Job Title", "Field"]
+    with open("app/files/temp/UA_data.csv", mode="w", newline='', encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(csv_header)
+    count = 0
+    for _, meta, html in get_page_cache().entries("UA"):
+        write_profile_rows(html, meta["profile_url"], meta["field"])
+        count += 1
+    print(f"Replayed {count} cached UA profiles.")
\ No newline at end of file
@@ -1,7 +1,7 @@
 from selenium import webdriver
-import undetected_chromedriver as uc
+from app.scrapers.helpers.driver_pool import driver_session
 from selenium.webdriver.common.by import By
-from pyalex import Works, Authors, Institutions
+from app.scrapers.helpers.openalex import get_openalex_client, short_id
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
@@ -111,49 +111,46 @@ def clean_staff(staff_list):
 
     return(cleaned_staff_list)
 
-def get_works_openalex(academics):
-    
+def get_works_openalex(academics, client=None):
+    client = client or get_openalex_client()
     UniMelb_works = []
 
-    insts = Institutions().search("University of Melbourne").get()
-    print(f"{len(insts)} search result(s) found for the institution")
-    inst_id = insts[0]["id"].replace("https://openalex.org/", "")
+    inst_id = client.institution_id("University of Melbourne")
+    print(f"OpenAlex institution for the University of Melbourne: {inst_id}")
 
-    count = 0
     skipped_academics = []
+    matched = []
     for academic in (a for a in academics if not a["scraped"]):
-        auths = Authors().search(academic["name"]).filter(affiliations={"institution": {"id": inst_id}}).get()
+        auths = client.search_authors(academic["name"], institution_id=inst_id)
         print(f"{len(auths)} search result(s) found for {academic['name']}")
 
         try:
-            auth_id = auths[0]["id"].replace("https://openalex.org/", "")
+            auth_id = short_id(auths[0]["id"])
         except IndexError:
             print("Skipping due to no results")
             skipped_academics.append(academic["name"])
             continue
+        matched.append((academic, auth_id))
 
-        pager = Works().filter(author={"id": auth_id}).paginate(per_page=200)
-
-        works = []
-        for page in pager:
-            for work in page:
-                works.append(work)
+    # One paginated query per batch of authors; the results already carry every field used below
+    works_by_author = client.works_by_authors([auth_id for _, auth_id in matched])
 
+    count = 0
+    for academic, auth_id in matched:
+        works = works_by_author[auth_id]
         print(f"{len(works)} work(s) found for {academic['name']}")
 
         # store works in dict by name for deduplication
         auth_works = {}
 
-        for work in works:
-            work_id = work["id"].replace("https://openalex.org/", "")
-            this_work = Works()[work_id]
-
+        for this_work in works:
             work_name = this_work["display_name"]
             try:
                 work_source = this_work["primary_location"]["source"]["display_name"]
                 work_date = this_work["publication_date"][:4]
                 work_type = this_work["type"]
                 work_link = this_work["doi"]
+                work_issn = this_work["primary_location"]["source"].get("issn_l") or ""
             except (TypeError, KeyError, ValueError):
                 continue
 
@@ -161,7 +158,7 @@ def get_works_openalex(academics):
                 # first time seeing this work name
  
 
-                auth_works[work_name] = ( [ work_name, work_date, work_type, work_source, work_link, academic["name"], academic["url"], academic["role"] , academic["field"] ] )
+                auth_works[work_name] = ( [ work_name, work_date, work_type, work_source, work_link, academic["name"], academic["url"], academic["role"] , academic["field"], work_issn ] )
 
             else:
                 existing_source = auth_works[work_name][3]
@@ -170,6 +167,7 @@ def get_works_openalex(academics):
                 if existing_source == "SSRN Electronic Journal":
                     auth_works[work_name][3] = work_source
                     auth_works[work_name][1] = work_date
+                    auth_works[work_name][9] = work_issn
 
         # convert back to a list
         for work in auth_works:
@@ -279,17 +277,17 @@ def get_works_website(academics, driver):
 
 
 def scrape_UM():
-    csv_header = ["Title", "Year", "Type", "Journal Name", "Article URL", "Researcher Name", "Profile URL", "Job Title", "Field", "Level"]
+    csv_header = ["Title", "Year", "Type", "Journal Name", "Article URL", "Researcher Name", "Profile URL", "Job Title", "Field", "ISSN"]
     with open("app/files/temp/UM_data.csv", mode="w", newline='', encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(csv_header)
 
-    driver = uc.Chrome() #removed version_main=138
-    for url, field in links_to_scrape:
-        staff_list = get_staff(url, driver, field)
+    with driver_session() as driver:
+        for url, field in links_to_scrape:
+            staff_list = get_staff(url, driver, field)
 
-        academic_list = clean_staff(staff_list)
-        with open("app/files/temp/UM_data.csv", mode="a", newline='', encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerows(get_works_website(academic_list, driver))
-            writer.writerows(get_works_openalex(academic_list))
+            academic_list = clean_staff(staff_list)
+            with open("app/files/temp/UM_data.csv", mode="a", newline='', encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerows(get_works_website(academic_list, driver))
+                writer.writerows(get_works_openalex(academic_list))
@@ -4,19 +4,27 @@ from selenium.webdriver.chrome.options import Options
 import time
 import csv
 import re
-from pyalex import Works, Authors, Institutions
-import undetected_chromedriver as uc
+from concurrent.futures import ThreadPoolExecutor
+from app.scrapers.helpers.driver_pool import driver_session
+from app.scrapers.helpers.openalex import get_openalex_client, short_id
+from app.scrapers.helpers.page_cache import PageCache
+
+# Concurrent OpenAlex lookups when backfilling article URLs; the client rate limits them
+OPENALEX_WORKERS = 4
+# Title lookups are remembered for a year, so re-runs don't repeat them
+TITLE_CACHE_DIR = "app/files/cache/openalex_titles"
+TITLE_CACHE_TTL = 365 * 24 * 3600
+TITLE_CACHE_MAX_BYTES = 50 * 2**20
+INSTITUTION_NAME = "UNSW Sydney"
 
 
 # ---------------- OpenAlex Helpers ----------------
-def get_author_id(name):
+def get_author_id(name, client=None):
+    client = client or get_openalex_client()
     try:
-        authors = Authors().search(name).get()
+        authors = client.search_authors(name)
         if authors:
-            author_id = authors[0]["id"]
-            # Extract just the ID part if needed
-            if author_id.startswith("https://openalex.org/"):
-                return author_id.split("/")[-1]
+            return short_id(authors[0]["id"])
         return None
     except Exception as e:
         print("Author lookup error:", e)
@@ -31,14 +39,10 @@ def clean_name(name):
         flags=re.IGNORECASE
     ).strip()
 
-def get_ins_id(ins_name):
+def get_ins_id(ins_name, client=None):
+    client = client or get_openalex_client()
     try:
-        insts = Institutions().search(ins_name).get()
-        if insts:
-            inst_id = insts[0]["id"]
-            if inst_id.startswith("https://openalex.org/"):
-                return inst_id.split("/")[-1]
-        return None
+        return client.institution_id(ins_name)
     except Exception as e:
         print("Institution lookup error:", e)
         return None
@@ -47,45 +51,94 @@ def clean_title(title):
     # Remove all unwanted characters from the title
     return re.sub(r"[\"'“”‘’:]", "", title)
 
-def openAlex(title, year, author_id = None, institution_id = None):
+def title_key(title, year):
+    """Cache key for a title lookup: the title without case, punctuation or extra spaces, plus the year."""
+    title = re.sub(r"[^\w\s]", "", clean_title(title).lower())
+    return f"{' '.join(title.split())}|{year}"
+
+def openAlex(title, year, author_id = None, institution_id = None, client=None):
+    """
+    Returns the OpenAlex link for the best match for a publication title,
+    "" if there is none, or None if the lookup failed.
+    """
+    client = client or get_openalex_client()
     title = clean_title(title)
     try:
-        # Convert year to yyyy-mm-dd
+        filters = []
+        # Limit to the publication year
         if year and year.isdigit() and len(year) == 4:
-            from_date = f"{year}-01-01"
-            to_date = f"{year}-12-31"
-        else:
-            from_date = None
-            to_date = None
-
-        query = Works().search(title)
-        if from_date and to_date:
-            query = query.filter(
-                from_publication_date=from_date,
-                to_publication_date=to_date
-            )
-
+            filters.append(f"from_publication_date:{year}-01-01")
+            filters.append(f"to_publication_date:{year}-12-31")
         if author_id:
-            query = query.filter(author={"id": author_id})
+            filters.append(f"author.id:{author_id}")
         if institution_id:
-            query = query.filter(institution={"id": institution_id})
+            filters.append(f"institution.id:{institution_id}")
 
-        results = query.get()
-        
+        results = client.search("works", title, filter=",".join(filters), select=["id"], limit=1)
         if results:
-            # Get the OpenAlex ID and convert to a direct link
-            openalex_id = results[0]["id"]
-            if openalex_id.startswith("https://openalex.org/"):
-                return openalex_id
-            # If it's an API URL, extract the ID and build the link
-            match = re.search(r'W\d+', openalex_id)
-            if match:
-                return f"https://openalex.org/{match.group(0)}"
-        else:
-            return ""
+            return f"https://openalex.org/{short_id(results[0]['id'])}"
+        return ""
     except Exception as e:
         print("Error:", e)
-        return ""
+        return None
+
+_title_cache = None
+
+def get_title_cache():
+    global _title_cache
+    if _title_cache is None:
+        _title_cache = PageCache(path=TITLE_CACHE_DIR, ttl=TITLE_CACHE_TTL, max_bytes=TITLE_CACHE_MAX_BYTES)
+    return _title_cache
+
+def backfill_urls(researchers, client=None, workers=OPENALEX_WORKERS):
+    """
+    Fills in the Article URL of every scraped publication that has none, in place,
+    from OpenAlex. researchers is a list of (name, publications_info) pairs.
+    Lookups are answered from the title cache where possible; the rest run
+    concurrently, once per distinct title and year, after the scrape is done.
+    """
+    client = client or get_openalex_client()
+    cache = get_title_cache()
+    pending = {}  # title key -> (title, year, researcher name, [publications])
+    missing = cached = 0
+    for name, publications_info in researchers:
+        for pub in publications_info:
+            title, year, pub_url = pub[0], pub[1], pub[4]
+            if pub_url or not title:
+                continue
+            missing += 1
+            key = title_key(title, year)
+            url = cache.get(key)
+            if url is not None:
+                pub[4] = url
+                cached += 1
+            elif key in pending:
+                pending[key][3].append(pub)
+            else:
+                pending[key] = (title, year, name, [pub])
+    print(f"{missing} publications without a URL: {cached} from cache, {len(pending)} to look up on OpenAlex")
+    if not pending:
+        return
+
+    # Author & Institution ID for OpenAlex to look up
+    institution_id = get_ins_id(INSTITUTION_NAME, client)
+    names = list(dict.fromkeys(clean_name(name) for _, _, name, _ in pending.values()))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        author_ids = dict(zip(names, executor.map(lambda name: get_author_id(name, client), names)))
+        lookups = list(pending.items())
+        urls = executor.map(
+            lambda item: openAlex(item[1][0], item[1][1], author_ids[clean_name(item[1][2])], institution_id, client),
+            lookups
+        )
+        found = 0
+        for (key, (_, _, _, pubs)), url in zip(lookups, urls):
+            if url is None:
+                continue  # failed lookups aren't cached, so the next run retries them
+            cache.put(key, url, namespace="UNSW")
+            found += bool(url)
+            for pub in pubs:
+                pub[4] = url
+    print(f"Found {found} of {len(pending)} publications on OpenAlex")
 
 
 # ---------------- Scraping Function ----------------
@@ -119,10 +172,6 @@ def scraping(profile_url, driver):
     except Exception:
         role = ""
 
-    # Author ID & Institution ID for OpenAlex to look up
-    author_id = get_author_id(clean_name(name))
-    institution_id = get_ins_id("UNSW Sydney")
-
     for btn in buttons:
         for section, default_article_type in sections.items():
             if section in btn.text:
@@ -169,16 +218,12 @@ def scraping(profile_url, driver):
                     else:
                         journal = ""
 
-                    # Article URL
+                    # Article URL; missing ones are looked up on OpenAlex by backfill_urls once every profile is scraped
                     try:
                         pub_url = pub.find_element(By.CSS_SELECTOR, "a").get_attribute("href")
                     except Exception:
                         pub_url = ""
 
-                    # If missing, check OpenAlex
-                    if not pub_url and title:
-                        pub_url = openAlex(title, year, author_id, institution_id)
-
                     publications_info.append([title, year, article_type, journal, pub_url])
                     print(f"Found publication: {title} ({article_type})")
                 break
@@ -203,43 +248,45 @@ def profile(page_url, driver):
 
 # ---------------- Main Function ----------------
 def scrape_UNSW():
-    driver = uc.Chrome()
-    departments_urls = [
-        ("https://www.unsw.edu.au/business/our-people#search=&filters=f.School%257CstaffSchool%3ASchool%2Bof%2BAccounting%252C%2BAuditing%2Band%2BTaxation&sort=metastaffLastName", "Accounting"),
-        ("https://www.unsw.edu.au/business/our-people#search=&filters=f.School%257CstaffSchool%3ASchool%2Bof%2BBanking%2Band%2BFinance&sort=metastaffLastName", "Finance")
-    ]
+    with driver_session() as driver:
+        departments_urls = [
+            ("https://www.unsw.edu.au/business/our-people#search=&filters=f.School%257CstaffSchool%3ASchool%2Bof%2BAccounting%252C%2BAuditing%2Band%2BTaxation&sort=metastaffLastName", "Accounting"),
+            ("https://www.unsw.edu.au/business/our-people#search=&filters=f.School%257CstaffSchool%3ASchool%2Bof%2BBanking%2Band%2BFinance&sort=metastaffLastName", "Finance")
+        ]
     
-    num_ranks = 12
-    profile_urls = []
-
-    for base_urls, fields in departments_urls:
-        start_rank = 1
-        # Loop to paginate through the list of profiles
-        while True:
-            page_url = f"{base_urls}&startRank={start_rank}&numRanks={num_ranks}"
-            urls = profile(page_url, driver)
-            if not urls:
-                break
-            profile_urls.extend((u, fields) for u in urls)
-
-            start_rank += num_ranks
-            time.sleep(1)
-
-    csv_header = ["Title", "Year", "Type", "Journal Name", "Article URL", "Researcher Name", "Profile URL", "Job Title", "Field"]
-    with open("app/files/temp/UNSW_data.csv", mode="w", newline='', encoding="utf-8") as f:
+        num_ranks = 12
+        profile_urls = []
+
+        for base_urls, fields in departments_urls:
+            start_rank = 1
+            # Loop to paginate through the list of profiles
+            while True:
+                page_url = f"{base_urls}&startRank={start_rank}&numRanks={num_ranks}"
+                urls = profile(page_url, driver)
+                if not urls:
+                    break
+                profile_urls.extend((u, fields) for u in urls)
+
+                start_rank += num_ranks
+                time.sleep(1)
+
+        csv_header = ["Title", "Year", "Type", "Journal Name", "Article URL", "Researcher Name", "Profile URL", "Job Title", "Field"]
+        with open("app/files/temp/UNSW_data.csv", mode="w", newline='', encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(csv_header)
+
+        all_data = []
+        for url, fields in profile_urls:
+            name, publications_info, role = scraping(url, driver)
+            all_data.append((url, fields, name, publications_info, role))
+
+    backfill_urls([(name, publications_info) for _, _, name, publications_info, _ in all_data])
+    with open("app/files/temp/UNSW_data.csv", mode="a", newline='', encoding="utf-8") as f:
         writer = csv.writer(f)
-        writer.writerow(csv_header)
-
-    all_data = []
-    for url, fields in profile_urls:
-        name, publications_info, role = scraping(url, driver)
-        for pub in publications_info:
-            with open("app/files/temp/UNSW_data.csv", mode="a", newline='', encoding="utf-8") as f:
-                writer = csv.writer(f)
+        for url, fields, name, publications_info, role in all_data:
+            for pub in publications_info:
                 writer.writerow(pub + [name, url, role, fields])  # Append fields
 
-    driver.quit()
-
     print("Scraping complete. Data saved to UNSW_data.csv")
 
     print("Scraping complete. Data saved to UNSW_data.csv")
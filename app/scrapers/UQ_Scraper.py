@@ -5,10 +5,12 @@ from typing import List, Optional, Tuple
 from urllib.parse import urlparse
 
 from bs4 import BeautifulSoup
-import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from app.scrapers.helpers.driver_pool import driver_session
+from app.scrapers.helpers.page_cache import get_page_cache, cached_page
+from app.scrapers.helpers.checkpoints import ScrapeCheckpoint
 
 # ========= CONFIG =========
 UNIVERSITY_NAME = "The University of Queensland"
@@ -33,18 +35,6 @@ PUBTYPE_MAP = {
 
 
 # ---------- Driver ----------
-def make_driver(headless: bool = False):
-    """构建稳定的 UC Chrome；不写死 version_main，避免和本机不匹配。"""
-    opts = uc.ChromeOptions()
-    if headless:
-        opts.add_argument("--headless=old")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--window-size=1280,1100")
-    opts.add_argument("--lang=en-US,en")
-    return uc.Chrome(options=opts)
-
-
 def wait_for_body(driver, timeout: int):
     WebDriverWait(driver, timeout).until(
         EC.presence_of_element_located((By.TAG_NAME, "body"))
@@ -232,39 +222,66 @@ def parse_researcher_profile(html: str, profile_url: str):
 
 
 def scrape_UQ(headless: bool = False):
-    driver = make_driver(headless=headless)
-    try:
-        entries = collect_entry_links(STAFF_INDEX_PAGES, driver)
-        print("Entry URLs:", len(entries))
-        profiles = set()
-        for entry in entries:
-            res= resolve_to_profile(driver, entry)
-            if res:
-                prof_url, dept = res
-                profiles.add((prof_url.rstrip("/"), dept))
-            else:
-                print("  ! No researcher profile found:", entry)
-
-        profiles_sorted = sorted(profiles, key=lambda x: x[0])
+    if get_page_cache().replaying:
+        return replay_UQ()
+    with driver_session(headless=headless) as driver:
+        # Writes the CSV header, or picks up after the last profile an interrupted run wrote
+        checkpoint = ScrapeCheckpoint("UQ").start()
+
+        def find_profiles():
+            entries = collect_entry_links(STAFF_INDEX_PAGES, driver)
+            print("Entry URLs:", len(entries))
+            profiles = set()
+            for entry in entries:
+                res= resolve_to_profile(driver, entry)
+                if res:
+                    prof_url, dept = res
+                    profiles.add((prof_url.rstrip("/"), dept))
+                else:
+                    print("  ! No researcher profile found:", entry)
+            return sorted(profiles, key=lambda x: x[0])
+
+        profiles_sorted = checkpoint.listing("profiles", find_profiles)
         print(f"Resolved {len(profiles_sorted)} researcher profile URLs.")
 
-        csv_header = ["Title", "Year", "Type", "Journal Name", "Article URL", "Researcher Name", "Profile URL", "Job Title", "Field"]
-        with open("app/files/temp/UQ_data.csv", mode="w", newline='', encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(csv_header)
         for i, (profile_url, dept) in enumerate(profiles_sorted, 1):
+            if checkpoint.done(f"{profile_url}#{dept}"):
+                continue
             print(f"[{i}/{len(profiles_sorted)}] {profile_url} | Dept: {dept}")
-            html = open_publications_journals(driver, profile_url)
-            publications = parse_researcher_profile(html, profile_url)
-            print(f"  parsed {len(publications)} pubs")
-            for row in publications:
-                with open("app/files/temp/UQ_data.csv", mode="a", newline='', encoding="utf-8") as f:
-                    writer = csv.writer(f)
-                    writer.writerow(row + [dept])  # append department as a separate field
-
-            time.sleep(POLITE_DELAY)
-    finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
\ No newline at end of file
+            html = cached_page(
+                f"{profile_url}#{dept}",
+                lambda: fetch_profile(driver, profile_url),
+                namespace="UQ",
+                meta={"profile_url": profile_url, "dept": dept}
+            )
+            write_profile_rows(html, profile_url, dept)
+            checkpoint.mark_done(f"{profile_url}#{dept}")
+        checkpoint.finish()
+
+
+def fetch_profile(driver, profile_url: str) -> str:
+    html = open_publications_journals(driver, profile_url)
+    time.sleep(POLITE_DELAY)
+    return html
+
+
+def write_profile_rows(html: str, profile_url: str, dept: str):
+    publications = parse_researcher_profile(html, profile_url)
+    print(f"  parsed {len(publications)} pubs")
+    with open("app/files/temp/UQ_data.csv", mode="a", newline='', encoding="utf-8") as f:
+        writer = csv.writer(f)
+        for row in publications:
+            writer.writerow(row + [dept])  # append department as a separate field
+
+
+def replay_UQ():
+    """Re-parses every cached UQ profile into UQ_data.csv without opening a browser."""
+    csv_header = ["Title", "Year", "Type", "Journal Name", "Article URL", "Researcher Name", "Profile URL", "Job Title", "Field"]
+    with open("app/files/temp/UQ_data.csv", mode="w", newline='', encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(csv_header)
+    count = 0
+    for _, meta, html in get_page_cache().entries("UQ"):
+        write_profile_rows(html, meta["profile_url"], meta["dept"])
+        count += 1
+    print(f"Replayed {count} cached UQ profiles.")
\ No newline at end of file
@@ -6,7 +6,11 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import undetected_chromedriver as uc
+from app.scrapers.helpers.driver_pool import driver_session
+from app.scrapers.helpers.page_cache import get_page_cache, cached_page
+from app.scrapers.helpers.checkpoints import ScrapeCheckpoint, CSV_HEADER
+from urllib.parse import urljoin
+import lxml.html
 
 
 # URLS 
@@ -20,13 +24,6 @@ URLS = [
 CSV_OUT = "usyd_publications.csv"
 
 # ---------- driver ----------
-def make_driver(headless: bool = False):
-    opts = uc.ChromeOptions()
-    if headless:
-        opts.add_argument("--headless=new")
-    opts.add_argument("--window-size=1280,1100")
-    return uc.Chrome(options=opts)
-
 def wait_css(driver, css, t=15):
     return WebDriverWait(driver, t).until(EC.presence_of_element_located((By.CSS_SELECTOR, css)))
 
@@ -186,15 +183,32 @@ def is_empty_title(s: str) -> bool:
 
 # ---------- parse a profile ----------
 
-def parse_profile(driver, researcher_name: str, profile_url: str, researcher_role: str, field: str):
-
-    """
-    Parse a single profile:
-      - open page,
-      - expand the 'By Type' tab (#home),
-      - iterate 'li' items,
-      - extract title/year/type/journal/url and return rows for this researcher.
-    """
+# Elements that start a new line in the rendered text, so their words don't run together
+BLOCK_TAGS = {"br", "p", "div", "li", "ul", "ol", "tr", "td", "th", "table", "h1", "h2", "h3", "h4", "h5", "h6"}
+
+def _collect_text(node, parts):
+    if isinstance(node.tag, str) and node.tag not in ("script", "style"):
+        block = node.tag in BLOCK_TAGS
+        if block:
+            parts.append(" ")
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            _collect_text(child, parts)
+        if block:
+            parts.append(" ")
+    if node.tail:
+        parts.append(node.tail)
+
+def node_text(el) -> str:
+    """Whitespace-collapsed text of an element, as the browser would render it."""
+    parts = [el.text or ""]
+    for child in el:
+        _collect_text(child, parts)
+    return clean_spaces("".join(parts))
+
+def load_profile(driver, profile_url: str) -> str:
+    """Opens a profile, expands the 'By Type' tab (#home) and returns the page source."""
     driver.get(profile_url)
     wait_css(driver, "body")
     # wait for publications list to load, fallback to short sleep if slow
@@ -208,52 +222,42 @@ def parse_profile(driver, researcher_name: str, profile_url: str, researcher_rol
     # expand **By Type** only
     click_expand_all_in_pane(driver, "#home")
 
-    # Only the active "By Type" pane to avoid duplicates from "By Year"
-    items = driver.find_elements(By.CSS_SELECTOR, "#home ul.pubType li")
-    if not items:
+    if not driver.find_elements(By.CSS_SELECTOR, "#home ul.pubType li"):
         time.sleep(0.5)  # some pages hydrate slowly
-        items = driver.find_elements(By.CSS_SELECTOR, "#home ul.pubType li")
+    return driver.page_source
+
+def parse_profile_html(html: str, researcher_name: str, profile_url: str, researcher_role: str, field: str):
+    """
+    Parse a single profile's expanded page:
+      - iterate the 'li' items of the 'By Type' tab (#home),
+      - extract title/year/type/journal/url and return rows for this researcher.
+    """
+    doc = lxml.html.fromstring(html)
+    # Only the active "By Type" pane to avoid duplicates from "By Year"
+    items = doc.xpath("//*[@id='home']//ul[contains(concat(' ', normalize-space(@class), ' '), ' pubType ')]//li")
 
     results = []
 
     for li in items:
-        raw_text = clean_spaces(li.text)
+        raw_text = node_text(li)
 
         # pub_type (section heading)
-        try:
-            pub_type = clean_spaces(li.find_element(
-                By.XPATH, "ancestor::tr[1]//p/strong"
-            ).text)
-        except Exception:
-            try:
-                pub_type = clean_spaces(li.find_element(
-                    By.XPATH, "preceding::p[strong][1]/strong"
-                ).text)
-            except Exception:
-                pub_type = ""
+        headings = li.xpath("ancestor::tr[1]//p/strong") or li.xpath("preceding::p[strong][1]/strong")
+        pub_type = node_text(headings[0]) if headings else ""
 
         # Year
         m_year = re.search(r"\b(19|20)\d{2}\b", raw_text)
         year = m_year.group(0) if m_year else ""
 
         # DOI / URL
-        article_url = ""
-        for a in li.find_elements(By.CSS_SELECTOR, "a[href]"):
-            href = (a.get_attribute("href") or "").strip()
-            if "doi.org" in href:
-                article_url = href
-                break
+        hrefs = [urljoin(profile_url, a.get("href").strip()) for a in li.xpath(".//a[@href]")]
+        article_url = next((href for href in hrefs if "doi.org" in href), "")
         if not article_url:
             # fallback: any external link that isn't on sydney.edu.au
-            for a in li.find_elements(By.CSS_SELECTOR, "a[href]"):
-                href = (a.get_attribute("href") or "").strip()
-                if href and "sydney.edu.au" not in href:
-                    article_url = href
-                    break
+            article_url = next((href for href in hrefs if href and "sydney.edu.au" not in href), "")
 
         # emphasis candidates: title/journal/book often italicized
-        em_els = li.find_elements(By.CSS_SELECTOR, "em, i, cite")
-        em_texts = [clean_spaces(e.text) for e in em_els if clean_spaces(e.text)]
+        em_texts = [text for text in (node_text(e) for e in li.xpath(".//em | .//i | .//cite")) if text]
         first_em = em_texts[0] if em_texts else ""
         last_em  = em_texts[-1] if em_texts else ""
 
@@ -302,36 +306,58 @@ def parse_profile(driver, researcher_name: str, profile_url: str, researcher_rol
 
     return results
 
-def scrape_USYD(urls: List[str] = URLS, *, print_names: bool = False) -> List[List[str]]:
-    """Collect and return CSV rows only (no header, no writing)."""
-    d = make_driver()
-    csv_header = ["Title", "Year", "Type", "Journal Name", "Article URL", "Researcher Name", "Profile URL", "Job Title", "Field"]
-    with open("app/files/temp/USYD_data.csv", mode="w", newline='', encoding="utf-8") as f:
+def parse_profile(driver, researcher_name: str, profile_url: str, researcher_role: str, field: str):
+    """Loads a profile through the page cache, reading the page once, and parses its rows."""
+    html = cached_page(
+        f"{profile_url}#{field}",
+        lambda: load_profile(driver, profile_url),
+        namespace="USYD",
+        meta={"name": researcher_name, "profile_url": profile_url, "role": researcher_role, "field": field}
+    )
+    return parse_profile_html(html, researcher_name, profile_url, researcher_role, field)
+
+def write_profile_rows(lines):
+    for i in range(len(lines)):
+        job_title_split = lines[i][-2].split('\n')
+        if len(job_title_split) > 1:
+            lines[i][-2] = job_title_split[0].strip()
+    with open("app/files/temp/USYD_data.csv", mode="a", newline='', encoding="utf-8") as f:
         writer = csv.writer(f)
-        writer.writerow(csv_header)
+        writer.writerows(lines)  # write all rows for this researcher
 
-    try:
+def replay_USYD():
+    """Re-parses every cached USYD profile into USYD_data.csv without opening a browser."""
+    count = 0
+    for _, meta, html in get_page_cache().entries("USYD"):
+        write_profile_rows(parse_profile_html(html, meta["name"], meta["profile_url"], meta["role"], meta["field"]))
+        count += 1
+    print(f"Replayed {count} cached USYD profiles.")
+
+def scrape_USYD(urls: List[str] = URLS, *, print_names: bool = False) -> List[List[str]]:
+    """Collect and return CSV rows only (no header, no writing)."""
+    if get_page_cache().replaying:
+        with open("app/files/temp/USYD_data.csv", mode="w", newline='', encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+        return replay_USYD()
+
+    # Writes the CSV header, or picks up after the last profile an interrupted run wrote
+    checkpoint = ScrapeCheckpoint("USYD").start()
+    with driver_session() as d:
         for url, fields in urls:
-            researchers = get_researchers(d, url)
+            researchers = checkpoint.listing(url, lambda: get_researchers(d, url))
             if print_names:
                 print(len(researchers), "researchers found on", url, "\n")
                 for name, _ in researchers:
                     print(name)
             for r_name, r_url, r_role in researchers:
+                key = f"{r_url}#{fields}"
+                if checkpoint.done(key):
+                    continue
                 try:
-                    lines = parse_profile(d, r_name, r_url, r_role, fields)
-                    for i in range(len(lines)):
-                        job_title_split = lines[i][-2].split('\n')
-                        if len(job_title_split) > 1:
-                            lines[i][-2] = job_title_split[0].strip()
-                    with open("app/files/temp/USYD_data.csv", mode="a", newline='', encoding="utf-8") as f:
-                        writer = csv.writer(f)
-                        writer.writerows(lines)  # write all rows for this researcher
+                    write_profile_rows(parse_profile(d, r_name, r_url, r_role, fields))
+                    checkpoint.mark_done(key)
                 except Exception as e:
                     print(f"Failed on {r_name}: {e}")
                 time.sleep(0.25)
-    finally:
-        try:
-            d.quit()
-        except Exception:
-            pass
\ No newline at end of file
+    checkpoint.finish()
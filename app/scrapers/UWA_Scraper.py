@@ -1,43 +1,44 @@
-import undetected_chromedriver as uc
+from app.scrapers.helpers.driver_pool import driver_session
 import pandas as pd
 import csv
-from app.scrapers.helpers.big3_functions import scrape_publications, find_profile_urls
+from app.scrapers.helpers.big3_functions import scrape_profiles, find_profile_urls
+from app.scrapers.helpers.fingerprints import FingerprintTracker
+from app.scrapers.helpers.checkpoints import ScrapeCheckpoint
 
 def scrape_UWA():
     # Load classification CSV
     df = pd.read_csv("app/files/uploads_current/UWA_staff_field_upload.csv", encoding="latin1")
     field_lookup = dict(zip(df["Name"], df["Field"]))
 
-    options = uc.ChromeOptions()
-    # options.add_argument("--no-sandbox")
-    # options.add_argument("--disable-gpu")
-    # options.add_argument("--window-size=1280,800")
-    # options.add_argument("--lang=en-US,en")
-    # options.add_argument("--headless")  # Uncomment for headless mode
-    driver = uc.Chrome()
-    print("Chrome launched!")
-    profiles_url = "https://www.uwa.edu.au/schools/business/accounting-and-finance"
-    base = "https://research-repository.uwa.edu.au"
+    # Pages are fetched over HTTP, so Chrome only starts if a page needs it
+    with driver_session(lazy=True) as driver:
+        profiles_url = "https://www.uwa.edu.au/schools/business/accounting-and-finance"
+        base = "https://research-repository.uwa.edu.au"
 
-    profile_urls = find_profile_urls(profiles_url, base, driver)
-    print(f"Found {len(profile_urls)} profile URLs")
+        # Writes the CSV header, or picks up after the last profile an interrupted run wrote
+        checkpoint = ScrapeCheckpoint("UWA").start()
+        profile_urls = checkpoint.listing(profiles_url, lambda: find_profile_urls(profiles_url, base, driver))
+        print(f"Found {len(profile_urls)} profile URLs")
+        remaining = [(profile_url, None) for profile_url in profile_urls if not checkpoint.done(profile_url)]
 
-    csv_header = ["Title", "Year", "Type", "Journal Name", "Article URL", "Researcher Name", "Profile URL", "Job Title", "Field"]
-    with open("app/files/temp/UWA_data.csv", mode="w", newline='', encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(csv_header)
+        def write_profile(profile_url, _, name, job_title, publications_info):
+            if publications_info is not None:
+                print(f"Scraped profile: {profile_url}")
 
-    for profile_url in profile_urls:
-        print(f"Scraping profile: {profile_url}")
-        name, job_title, publications_info = scrape_publications(profile_url, driver)
-        
-        # Lookup field in csv
-        print('Getting fields from "UWA Accounting Finance Staff_YW.csv"')
-        field = field_lookup.get(name, None)
-        print(f"Researcher: {name}, Field: {field}")
+                # Lookup field in csv
+                print('Getting fields from "UWA Accounting Finance Staff_YW.csv"')
+                field = field_lookup.get(name, None)
+                print(f"Researcher: {name}, Field: {field}")
 
-        print(f"Found {len(publications_info)} publications in {profile_url}")
-        for line in publications_info:
-            with open("app/files/temp/UWA_data.csv", mode="a", newline='', encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(line + [name, profile_url, job_title, field])  # Append fields
\ No newline at end of file
+                print(f"Found {len(publications_info)} publications in {profile_url}")
+                with open("app/files/temp/UWA_data.csv", mode="a", newline='', encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    for line in publications_info:
+                        writer.writerow(line + [name, profile_url, job_title, field])  # Append fields
+            checkpoint.mark_done(profile_url)
+
+        # Profiles are fetched concurrently; rows are still written in profile order
+        tracker = FingerprintTracker("UWA", resume=checkpoint.resumed)
+        scrape_profiles(remaining, driver, write_profile, tracker=tracker)
+        print(f"Skipped {tracker.skipped} unchanged profiles")
+        checkpoint.finish()
@@ -1,105 +1,433 @@
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from urllib.parse import urlparse
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+import statistics
+import threading
 import time
+from app.scrapers.helpers.page_cache import get_page_cache, cached_page, PageCacheMiss
+from app.scrapers.helpers.fingerprints import profile_fingerprint
+
+# Pause after each page so the portals aren't hit back to back
+POLITE_DELAY = 0.5
+# Bounds on how long to wait for a page, scaled between them by the host's observed load times
+MIN_WAIT_SEC = 10
+MAX_WAIT_SEC = 30
+# Bounds on how often the DOM is polled while waiting
+MIN_POLL_SEC = 0.05
+MAX_POLL_SEC = 0.5
+# How long a fully loaded page must stay without the expected elements before it counts as empty
+EMPTY_GRACE_SEC = 1.0
+# Number of recent load times kept per host
+LOAD_HISTORY = 50
+
+PROFILE_LINK_CSS = "a[href*='/en/persons/']"
+PROFILE_HEADER_CSS = "div.header.person-details, span.job-title"
+PUBLICATION_CSS = "div.rendering_researchoutput_portal-short"
+# Pure's "no results" message on a listing or publications page with nothing (more) to show
+EMPTY_RESULTS_CSS = "div.empty-results, p.empty-results, div.no-results, p.no-results"
+
+# Browser-like headers for direct HTTP requests to the portals
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9"
+}
+HTTP_TIMEOUT = 30
+BOT_CHALLENGE_MARKERS = ("<title>Just a moment", "<title>Attention Required", "challenge-platform", "cf-chl-")
+# Requests in flight to one portal at a time when profiles are fetched concurrently
+PER_HOST_CONCURRENCY = 4
+
+class PageLoadError(RuntimeError):
+    """Raised when the browser never showed a page's content, so its half-loaded source must not be used."""
+
+_load_times = defaultdict(lambda: deque(maxlen=LOAD_HISTORY))
+_load_times_lock = threading.Lock()
+
+def record_load_time(host, seconds):
+    with _load_times_lock:
+        _load_times[host].append(seconds)
+
+def load_time_stats(host):
+    """Returns (median, slowest) of the recent load times seen for a host, or None if there are none yet."""
+    with _load_times_lock:
+        times = list(_load_times[host])
+    if not times:
+        return None
+    return statistics.median(times), max(times)
+
+def wait_settings(host):
+    """
+    Returns (timeout, poll interval) for a host. The timeout allows a few times the
+    slowest load seen so far and the DOM is polled about ten times per typical load.
+    """
+    stats = load_time_stats(host)
+    if stats is None:
+        return MAX_WAIT_SEC, MAX_POLL_SEC / 2
+    median, slowest = stats
+    timeout = min(MAX_WAIT_SEC, max(MIN_WAIT_SEC, slowest * 3))
+    poll = min(MAX_POLL_SEC, max(MIN_POLL_SEC, median / 10))
+    return timeout, poll
+
+def load_page(driver, url, ready_css, empty_css=None):
+    """
+    Loads url and blocks until an element matching ready_css is present, replacing a
+    fixed sleep. Returns "ready" when it is found, "empty" when empty_css is found or the
+    page finished loading without it (e.g. past the last page of a listing), and None on
+    timeout. Load times are recorded per host to tune later waits.
+    """
+    host = urlparse(url).netloc
+    timeout, poll = wait_settings(host)
+    start = time.perf_counter()
+    loaded_at = []
+
+    def page_state(d):
+        if d.find_elements(By.CSS_SELECTOR, ready_css):
+            return "ready"
+        if empty_css and d.find_elements(By.CSS_SELECTOR, empty_css):
+            return "empty"
+        # Bot checks are fully loaded pages too, so keep waiting until the real page replaces them
+        if d.execute_script("return document.readyState") == "complete" and not d.title.startswith("Just a moment"):
+            if not loaded_at:
+                loaded_at.append(time.perf_counter())
+            elif time.perf_counter() - loaded_at[0] >= EMPTY_GRACE_SEC:
+                return "empty"
+        return False
+
+    driver.get(url)
+    try:
+        state = WebDriverWait(driver, timeout, poll_frequency=poll).until(page_state)
+    except TimeoutException:
+        print(f"Timed out after {timeout:.0f}s waiting for {url}")
+        return None
+    # Pages judged empty include the grace period, which isn't load time
+    record_load_time(host, (loaded_at[0] if state == "empty" and loaded_at else time.perf_counter()) - start)
+    time.sleep(POLITE_DELAY)
+    return state
+
+_http = threading.local()
+
+def make_http_session(pool_size=4):
+    """Creates a keep-alive session holding up to pool_size connections per host."""
+    session = requests.Session()
+    session.headers.update(HTTP_HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_http_session():
+    """Returns this thread's keep-alive session for fetching portal pages."""
+    session = getattr(_http, "session", None)
+    if session is None:
+        session = _http.session = make_http_session()
+    return session
+
+def has_class(name):
+    """XPath predicate matching elements with the given CSS class."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# The selectors load_page waits on, as XPath for checking a page fetched over HTTP.
+# Profile links must name a person: the portal's own navigation links to the listing itself
+SELECTOR_XPATHS = {
+    PROFILE_LINK_CSS: (
+        "//a[substring-after(@href, '/en/persons/') != ''"
+        " and not(starts-with(substring-after(@href, '/en/persons/'), '?'))]"
+    ),
+    PROFILE_HEADER_CSS: f"//div[{has_class('header')} and {has_class('person-details')}] | //span[{has_class('job-title')}]",
+    PUBLICATION_CSS: f"//div[{has_class('rendering_researchoutput_portal-short')}]",
+    EMPTY_RESULTS_CSS: (
+        f"//div[{has_class('empty-results')}] | //p[{has_class('empty-results')}]"
+        f" | //div[{has_class('no-results')}] | //p[{has_class('no-results')}]"
+    )
+}
+
+def needs_browser(html, ready_css, empty_css=None):
+    """
+    True unless a page shows what the browser would have waited for (ready_css, or
+    empty_css), so script shells, half-rendered pages and bot checks are loaded in
+    the browser instead.
+    """
+    if any(marker in html for marker in BOT_CHALLENGE_MARKERS):
+        return True
+    try:
+        doc = lxml.html.fromstring(html)
+    except Exception:
+        return True
+    return not any(doc.xpath(SELECTOR_XPATHS[css]) for css in (ready_css, empty_css) if css)
+
+def fetch_html(url, ready_css, empty_css=None, session=None):
+    """
+    Fetches a page over plain HTTP. Returns its HTML, or None if the browser is needed
+    because the page doesn't show ready_css or empty_css.
+    """
+    try:
+        response = (session or get_http_session()).get(url, timeout=HTTP_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"HTTP fetch failed for {url}: {e}")
+        return None
+    if response.status_code != 200 or needs_browser(response.text, ready_css, empty_css):
+        return None
+    time.sleep(POLITE_DELAY)
+    return response.text
+
+def browser_html(url, driver, ready_css, empty_css=None):
+    """
+    Loads a page in the browser and returns its source once it shows ready_css or
+    empty_css. A page that times out twice raises PageLoadError instead of returning
+    a half-rendered page or a bot check, so it is never parsed or cached.
+    """
+    for _ in range(2):
+        print(f"Loading {url} in the browser")
+        if load_page(driver, url, ready_css, empty_css) is not None:
+            return driver.page_source
+    raise PageLoadError(f"{url} did not finish loading")
+
+def get_page_html(url, driver, ready_css, empty_css=None):
+    """
+    Returns a page's HTML from the page cache, or fetched directly where possible
+    and through the browser otherwise.
+    """
+    return cached_page(
+        url,
+        lambda: fetch_html(url, ready_css, empty_css) or browser_html(url, driver, ready_css, empty_css),
+        namespace=urlparse(url).netloc
+    )
+
+def element_text(element):
+    return " ".join(element.text_content().split()) if element is not None else ""
+
+def first(elements):
+    return elements[0] if elements else None
+
+def parse_profile_links(html, page_url, base):
+    """Returns the researcher profile URLs linked from a listing page, in page order."""
+    doc = lxml.html.fromstring(html)
+    doc.make_links_absolute(page_url)
+    prefix = f"{base}/en/persons/"
+    return list(dict.fromkeys(href for href in doc.xpath("//a/@href") if href.startswith(prefix)))
+
+def parse_job_title(html):
+    """Returns a researcher's job title from their profile page, or ""."""
+    doc = lxml.html.fromstring(html)
+    titles = [element_text(e) for e in doc.xpath(f"//span[{has_class('job-title')}]")]
+    titles = [t for t in titles if t]
+    if titles:
+        return " ".join(dict.fromkeys(titles))
+    fallback = first(doc.xpath(
+        f"//div[{has_class('header')} and {has_class('person-details')}]"
+        f"/div[{has_class('rendering_person_persontitlerendererportal')}]/p"
+    ))
+    return element_text(fallback)
+
+def parse_publications(html, page_url):
+    """Returns [Title, Year, Type, Journal, Article URL] for each research output on a publications page."""
+    doc = lxml.html.fromstring(html)
+    doc.make_links_absolute(page_url)
+    publications_info = []
+    for div in doc.xpath(f"//div[{has_class('rendering_researchoutput_portal-short')}]"):
+        # Title and URL
+        a_tag = first(div.xpath(f".//h3[{has_class('title')}]//a"))
+        span = first(a_tag.xpath(".//span")) if a_tag is not None else None
+        if span is not None:
+            pub_title = element_text(span)
+            publication_url = a_tag.get("href", "")
+        else:
+            pub_title = ""
+            publication_url = ""
+        # Year
+        date_span = first(div.xpath(f".//span[{has_class('date')}]"))
+        year = element_text(date_span)[-4:]
+        # Type
+        type_val = element_text(first(div.xpath(f".//span[{has_class('type_classification_parent')}]")))
+        if type_val[-2:] == ' ›':
+            type_val = type_val[:-2]
+        # Journal
+        journal = ""
+        if "Contribution to journal" in type_val:
+            journal_span = first(div.xpath(f".//span[{has_class('journal')}]//a//span"))
+            if journal_span is not None:
+                journal = element_text(journal_span)[:-1] # Remove trailing full stop
+        publications_info.append([pub_title, year, type_val, journal, publication_url])
+    return publications_info
 
 def find_profile_urls(page_url, base, driver):
-    """Finds all researcher profile URLs on all paginated pages using Selenium by matching href prefix."""
+    """
+    Finds all researcher profile URLs on all paginated pages by matching href prefix.
+    Pages are fetched over HTTP, with the driver only used for pages that need a browser.
+    """
     profile_urls = set()
     page = 0
     while True:
         paged_url = f"{page_url}?page={page}"
-        driver.get(paged_url)
-        time.sleep(8)
-        a_tags = driver.find_elements(By.TAG_NAME, "a")
+        html = get_page_html(paged_url, driver, PROFILE_LINK_CSS, EMPTY_RESULTS_CSS)
         found_on_page = 0
-        for a in a_tags:
-            href = a.get_attribute("href")
-            if href and href.startswith(f"{base}/en/persons/"):
-                if href not in profile_urls:
-                    print(f"Found profile URL: {href}")
-                    profile_urls.add(href)
-                    found_on_page += 1
+        for href in parse_profile_links(html, paged_url, base):
+            if href not in profile_urls:
+                print(f"Found profile URL: {href}")
+                profile_urls.add(href)
+                found_on_page += 1
         if found_on_page == 0:
             break
         page += 1
     return list(profile_urls)
 
-def scrape_publications(profile_url, driver):
+def profile_name(profile_url):
+    """Researcher name from a profile URL, e.g. https://research.monash.edu/en/persons/viet-nga-cao"""
+    name_part = profile_url.rstrip('/').split('/')[-1]  # 'viet-nga-cao'
+    return ' '.join(word.capitalize() for word in name_part.split('-'))
+
+def publications_page_url(profile_url, page):
+    if page == 0:
+        return f"{profile_url}/publications/"
+    return f"{profile_url}/publications/?page={page}"
+
+def scrape_publications(profile_url, driver, tracker=None):
     """
     Finds publication info for a given researcher
     Returns: (name, job_title, publications_info) where publications_info is a list of [Title, Date, Type, Journal, Article URL]
+    With a FingerprintTracker, publications_info is None for a profile whose job title and
+    first publications page are unchanged since it was last written, and later pages are skipped.
     """
-    driver.get(profile_url)
-    time.sleep(2)
-    # Try to get name robustly
-    try:
-        # Extract name from profile_url, e.g. https://research.monash.edu/en/persons/viet-nga-cao
-        name_part = profile_url.rstrip('/').split('/')[-1]  # 'viet-nga-cao'
-        name = ' '.join(word.capitalize() for word in name_part.split('-'))
-    except Exception:
-        name = ""
-    # Try to get job title
-    try:
-        titles = [e.text.strip() for e in driver.find_elements(By.CSS_SELECTOR, "span.job-title") if e.text.strip()]
-        job_title = " ".join(dict.fromkeys(titles)) if titles else ""
-        if job_title == "":
-            # Try to get <p> under div.header.person-details
-            try:
-                job_title = driver.find_element(
-                    By.CSS_SELECTOR, "div.header.person-details > div.rendering_person_persontitlerendererportal > p"
-                ).text.strip()
-            except Exception:
-                job_title = ""
-    except Exception:
-        # Try to get <p> under div.header.person-details if span.job-title fails
-        try:
-            job_title = driver.find_element(
-                By.CSS_SELECTOR, "div.header.person-details > div.rendering_person_persontitlerendererportal > p"
-            ).text.strip()
-        except Exception:
-            job_title = ""
+    name = profile_name(profile_url)
+    job_title = parse_job_title(get_page_html(profile_url, driver, PROFILE_HEADER_CSS))
+
     publications_info = []
     page = 0
     while True:
-        if page == 0: page_url = f"{profile_url}/publications/"
-        else: page_url = f"{profile_url}/publications/?page={page}"
-        driver.get(page_url)
-        time.sleep(10)
-        publication_divs = driver.find_elements(By.CSS_SELECTOR, "div.rendering_researchoutput_portal-short")
-        if not publication_divs:
+        page_url = publications_page_url(profile_url, page)
+        publications = parse_publications(get_page_html(page_url, driver, PUBLICATION_CSS, EMPTY_RESULTS_CSS), page_url)
+        if page == 0 and tracker is not None:
+            fingerprint = profile_fingerprint(job_title, publications)
+            if tracker.unchanged(profile_url, fingerprint):
+                return name, job_title, None
+        if not publications:
             break
-        for div in publication_divs:
-            # Title and URL (new structure)
-            try:
-                a_tag = div.find_element(By.CSS_SELECTOR, "h3.title a")
-                pub_title = a_tag.find_element(By.CSS_SELECTOR, "span").text.strip()
-                publication_url = a_tag.get_attribute("href")
-            except Exception:
-                pub_title = ""
-                publication_url = ""
-            # Year
-            try:
-                date_span = div.find_element(By.CSS_SELECTOR, "span.date")
-                year = date_span.text.strip()[-4:]
-            except Exception:
-                year = ""
-            # Type
-            try:
-                type_span = div.find_element(By.CSS_SELECTOR, "span.type_classification_parent")
-                type_val = type_span.text.strip()
-                if type_val[-2:] == ' ›':
-                    type_val = type_val[:-2]
-            except Exception:
-                type_val = ""
-            # Journal
-            try:
-                if "Contribution to journal" in type_val:
-                    journal_span = div.find_element(By.CSS_SELECTOR, "span.journal a span")
-                    journal = journal_span.text.strip()[:-1] # Remove trailing full stop
-                else:
-                    journal = ""
-            except Exception:
-                journal = ""
-            publications_info.append([pub_title, year, type_val, journal, publication_url])
-            print(f"Found publication: {pub_title}")
+        for publication in publications:
+            publications_info.append(publication)
+            print(f"Found publication: {publication[0]}")
         page += 1
-    return name, job_title, publications_info
\ No newline at end of file
+    if tracker is not None:
+        tracker.record(profile_url, fingerprint)
+    return name, job_title, publications_info
+
+def discard(future):
+    """Cancels a pending future, or retrieves the exception of a finished one so asyncio doesn't log it."""
+    if future is None:
+        return
+    if not future.done():
+        future.cancel()
+    elif not future.cancelled():
+        future.exception()
+
+class ProfileFetcher:
+    """
+    Fetches pages for many profiles at once from an event loop. Requests run in
+    worker threads on one shared keep-alive session, at most per_host at a time
+    per portal. Pages that need the browser are loaded one at a time, since a
+    driver can't be shared between threads.
+    """
+    def __init__(self, driver, per_host=PER_HOST_CONCURRENCY, tracker=None):
+        self.driver = driver
+        self.tracker = tracker
+        self.per_host = per_host
+        self.session = make_http_session(pool_size=per_host)
+        self.limits = defaultdict(lambda: asyncio.Semaphore(per_host))
+        self.browser_lock = asyncio.Lock()
+
+    async def fetch(self, url, ready_css, empty_css=None):
+        host = urlparse(url).netloc
+        cache = get_page_cache()
+        html = cache.get(url)
+        if html is not None:
+            return html
+        if cache.replaying:
+            raise PageCacheMiss(url)
+        async with self.limits[host]:
+            html = await asyncio.to_thread(fetch_html, url, ready_css, empty_css, self.session)
+        if html is None:
+            async with self.browser_lock:
+                html = await asyncio.to_thread(browser_html, url, self.driver, ready_css, empty_css)
+        cache.put(url, html, namespace=host)
+        return html
+
+    async def scrape_profile(self, profile_url):
+        """
+        Async scrape_publications. The profile page loads alongside the publications,
+        and the next publications page is requested as soon as the current one has
+        been parsed, while its rows are still being handed on.
+        """
+        profile_page = asyncio.ensure_future(self.fetch(profile_url, PROFILE_HEADER_CSS))
+        publications_info = []
+        page = 0
+        next_page = asyncio.ensure_future(self.fetch(publications_page_url(profile_url, 0), PUBLICATION_CSS, EMPTY_RESULTS_CSS))
+        try:
+            page_size = None
+            fingerprint = None
+            while next_page is not None:
+                html = await next_page
+                next_page = None
+                publications = parse_publications(html, publications_page_url(profile_url, page))
+                if page == 0 and self.tracker is not None:
+                    job_title = parse_job_title(await profile_page)
+                    fingerprint = profile_fingerprint(job_title, publications)
+                    if self.tracker.unchanged(profile_url, fingerprint):
+                        return profile_name(profile_url), job_title, None
+                if not publications:
+                    break
+                # Like scrape_publications, only an empty page ends the list. A full page starts the next
+                # while this one is recorded; a shorter one is probably the last, so the next is only checked after
+                full_page = page_size is None or len(publications) >= page_size
+                if full_page:
+                    next_page = asyncio.ensure_future(self.fetch(publications_page_url(profile_url, page + 1), PUBLICATION_CSS, EMPTY_RESULTS_CSS))
+                page_size = page_size or len(publications)
+                for publication in publications:
+                    publications_info.append(publication)
+                    print(f"Found publication: {publication[0]}")
+                if not full_page:
+                    next_page = asyncio.ensure_future(self.fetch(publications_page_url(profile_url, page + 1), PUBLICATION_CSS, EMPTY_RESULTS_CSS))
+                page += 1
+            job_title = parse_job_title(await profile_page)
+            if self.tracker is not None:
+                self.tracker.record(profile_url, fingerprint)
+            return profile_name(profile_url), job_title, publications_info
+        finally:
+            # A page that failed to load must not leave an unretrieved exception behind
+            for future in (profile_page, next_page):
+                discard(future)
+
+    async def scrape_profiles(self, profiles, on_profile):
+        tasks = [asyncio.ensure_future(self.scrape_profile(profile_url)) for profile_url, _ in profiles]
+        try:
+            # Results are handed over in input order, as soon as each one and those before it are done
+            for (profile_url, field), task in zip(profiles, tasks):
+                try:
+                    result = await task
+                except PageLoadError as e:
+                    # Not handed on, so it isn't written, fingerprinted or checkpointed and the next run retries it
+                    print(f"Skipping {profile_url}: {e}")
+                    continue
+                on_profile(profile_url, field, *result)
+        finally:
+            # Tasks that already failed need their exception retrieved, not just the pending ones cancelled
+            for task in tasks:
+                discard(task)
+
+def scrape_profiles(profiles, driver, on_profile, per_host=PER_HOST_CONCURRENCY, tracker=None):
+    """
+    Scrapes many (profile_url, field) pairs concurrently and calls
+    on_profile(profile_url, field, name, job_title, publications_info) for each, in the
+    order given, with the same results as calling scrape_publications on each in turn
+    (including publications_info of None for profiles the tracker finds unchanged).
+    """
+    async def run():
+        # Enough threads for every host's requests plus the browser
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=per_host * 2 + 1))
+        await ProfileFetcher(driver, per_host, tracker).scrape_profiles(profiles, on_profile)
+    asyncio.run(run())
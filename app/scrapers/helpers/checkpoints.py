@@ -0,0 +1,84 @@
+import csv
+import json
+import os
+import time
+
+from app.scrapers.helpers.page_cache import get_page_cache
+
+CSV_HEADER = ["Title", "Year", "Type", "Journal Name", "Article URL", "Researcher Name", "Profile URL", "Job Title", "Field"]
+
+def checkpoint_path(university):
+    return f"app/files/temp/{university}_checkpoint.json"
+
+class ScrapeCheckpoint:
+    """
+    Lets an interrupted university scrape pick up where it stopped. The checkpoint
+    file next to the scraped CSV records the profile lists already crawled, the
+    profiles whose rows are in the CSV, and the CSV's size after the last of them.
+
+    start() either begins a fresh CSV (writing the header) or, if a checkpoint from
+    an unfinished run exists, truncates the CSV back to that size, dropping the rows
+    of a profile that was cut off mid-write so they aren't written twice.
+    Call mark_done() after each profile's rows are written and finish() at the end.
+    """
+    def __init__(self, university, csv_path=None, header=CSV_HEADER):
+        self.university = university
+        self.csv_path = csv_path or f"app/files/temp/{university}_data.csv"
+        self.header = header
+        self.path = checkpoint_path(university)
+        self.state = {"listings": {}, "done": [], "csv_bytes": 0}
+        self.done_keys = set()
+        self.resumed = False
+        # Replays re-parse every cached page from scratch
+        self.enabled = not get_page_cache().replaying
+
+    def start(self):
+        if self.enabled and os.path.exists(self.path) and os.path.exists(self.csv_path):
+            with open(self.path, encoding="utf-8") as f:
+                self.state = json.load(f)
+            with open(self.csv_path, "r+b") as f:
+                f.truncate(self.state["csv_bytes"])
+            self.done_keys = set(self.state["done"])
+            self.resumed = True
+            print(f"Resuming {self.university} scrape: {len(self.done_keys)} profiles already done")
+            return self
+        with open(self.csv_path, mode="w", newline='', encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.header)
+        self.state["csv_bytes"] = os.path.getsize(self.csv_path)
+        self.save()
+        return self
+
+    def listing(self, name, fetch):
+        """Returns the list fetch() produced for name, from the checkpoint if an earlier run got that far."""
+        if name not in self.state["listings"]:
+            self.state["listings"][name] = fetch()
+            self.save()
+        return [tuple(item) if isinstance(item, list) else item for item in self.state["listings"][name]]
+
+    def done(self, key):
+        return key in self.done_keys
+
+    def mark_done(self, key):
+        """Records that every row for key is in the CSV."""
+        self.done_keys.add(key)
+        self.state["done"].append(key)
+        self.state["csv_bytes"] = os.path.getsize(self.csv_path)
+        self.save()
+
+    def save(self):
+        if not self.enabled:
+            return
+        self.state["updated_at"] = time.time()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, mode="w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+    def finish(self):
+        """The scrape completed, so the next run starts from scratch."""
+        # A replay never wrote this checkpoint, so it may be an interrupted live scrape's resume point
+        if not self.enabled:
+            return
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,182 @@
+import atexit
+import threading
+from contextlib import contextmanager
+
+import undetected_chromedriver as uc
+
+# Page loads after which a browser is quit and relaunched, so Chrome's memory stays flat on long runs
+DRIVER_MAX_PAGES = 200
+
+# undetected_chromedriver patches the same chromedriver binary on every launch, so launches must not overlap
+_launch_lock = threading.Lock()
+
+def make_chrome_options(headless=False):
+    opts = uc.ChromeOptions()
+    if headless:
+        opts.add_argument("--headless=new")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--window-size=1280,1100")
+    opts.add_argument("--lang=en-US,en")
+    return opts
+
+class PooledDriver:
+    """
+    A Chrome driver handed out by a DriverPool. Behaves like the driver it wraps,
+    but counts page loads and transparently relaunches the browser once it has
+    loaded max_pages pages or stopped responding.
+    """
+    def __init__(self, headless=False, max_pages=DRIVER_MAX_PAGES):
+        self.headless = headless
+        self.max_pages = max_pages
+        self.pages = 0
+        self._driver = None
+        self.start()
+
+    def __getattr__(self, name):
+        # Everything except get() goes straight to the underlying driver
+        return getattr(self._driver, name)
+
+    def start(self):
+        with _launch_lock:
+            self._driver = uc.Chrome(options=make_chrome_options(self.headless))
+        self.pages = 0
+
+    def quit(self):
+        if self._driver is None:
+            return
+        try:
+            self._driver.quit()
+        except Exception:
+            pass
+        self._driver = None
+
+    def restart(self):
+        self.quit()
+        self.start()
+
+    def is_healthy(self):
+        """True if the browser is still running and answering commands."""
+        if self._driver is None:
+            return False
+        try:
+            self._driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def get(self, url):
+        if self.pages >= self.max_pages:
+            print(f"Recycling browser after {self.pages} pages")
+            self.restart()
+        self.pages += 1
+        try:
+            return self._driver.get(url)
+        except Exception:
+            if self.is_healthy():
+                raise
+            # The browser died under us; start a fresh one and retry once
+            print("Browser stopped responding, relaunching")
+            self.restart()
+            return self._driver.get(url)
+
+class DriverPool:
+    """
+    Keeps idle Chrome browsers for reuse so each scraper worker pays the browser
+    startup cost once per run rather than once per scraper. Borrow a browser with
+    `with pool.driver() as driver:`; it is health checked on the way out and on
+    the way back in.
+    """
+    def __init__(self, headless=False, max_pages=DRIVER_MAX_PAGES):
+        self.headless = headless
+        self.max_pages = max_pages
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                return PooledDriver(headless=self.headless, max_pages=self.max_pages)
+            if driver.is_healthy():
+                return driver
+            driver.quit()
+
+    def release(self, driver):
+        if not driver.is_healthy():
+            driver.quit()
+            return
+        with self._lock:
+            self._idle.append(driver)
+
+    @contextmanager
+    def driver(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Quits every idle browser."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            driver.quit()
+
+class LazyDriver:
+    """
+    Stands in for a pooled driver but only borrows a browser from the pool the first
+    time it is used, for scrapers that mostly fetch pages without one.
+    """
+    def __init__(self, pool):
+        self._pool = pool
+        self._driver = None
+
+    def __getattr__(self, name):
+        if self._driver is None:
+            self._driver = self._pool.acquire()
+        return getattr(self._driver, name)
+
+    def release(self):
+        if self._driver is not None:
+            self._pool.release(self._driver)
+            self._driver = None
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_driver_pool(headless=False):
+    """Returns the shared pool for headed or headless browsers."""
+    with _pools_lock:
+        if headless not in _pools:
+            _pools[headless] = DriverPool(headless=headless)
+        return _pools[headless]
+
+@contextmanager
+def driver_session(headless=False, lazy=False):
+    """
+    Borrows a browser from the shared pool for the duration of the block.
+    With lazy=True the browser is only started if the block actually uses it.
+    """
+    pool = get_driver_pool(headless)
+    if not lazy:
+        with pool.driver() as driver:
+            yield driver
+        return
+    driver = LazyDriver(pool)
+    try:
+        yield driver
+    finally:
+        driver.release()
+
+def close_driver_pools():
+    """Quits every pooled browser. Call once a scraping run is finished."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
+
+# Don't leave Chrome processes behind when a scraper is run as a script
+atexit.register(close_driver_pools)
@@ -0,0 +1,115 @@
+import glob
+import hashlib
+import json
+import os
+import time
+
+from app.database import SessionLocal
+from app.models import ProfileFingerprints
+from app.scrapers.helpers.page_cache import get_page_cache
+
+# Profiles are re-scraped in full once their fingerprint is this old, even if it still matches,
+# to pick up changes the fingerprint can't see (e.g. an older publication added on a later page)
+FINGERPRINT_MAX_AGE = 30 * 24 * 3600
+
+def profile_fingerprint(*parts):
+    """Stable hash of a profile's scraped content (job title, publication rows, ...)."""
+    data = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+def pending_path(university):
+    return f"app/files/temp/{university}_fingerprints.json"
+
+class FingerprintTracker:
+    """
+    Decides which profiles a scrape can skip. Fingerprints stored in the database
+    are compared against freshly scraped ones; new fingerprints are kept in a side
+    file next to the scraped CSV and only move into the database once the update
+    pipeline has written that CSV (see confirm_fingerprints), so a failed run never
+    marks unwritten profiles as done.
+    """
+    def __init__(self, university, max_age=FINGERPRINT_MAX_AGE, resume=False):
+        self.university = university
+        self.max_age = max_age
+        self.pending = {}
+        self.skipped = 0
+        # Replays re-parse everything on purpose
+        self.enabled = not get_page_cache().replaying
+        self.stored = {}
+        if self.enabled:
+            db = SessionLocal()
+            try:
+                rows = db.query(ProfileFingerprints).filter(ProfileFingerprints.university == university).all()
+                self.stored = {row.profile_url: (row.fingerprint, row.checked_at) for row in rows}
+            finally:
+                db.close()
+        # A resumed scrape keeps the fingerprints of the profiles it already wrote
+        if resume and os.path.exists(pending_path(university)):
+            with open(pending_path(university), encoding="utf-8") as f:
+                self.pending = json.load(f)
+        self.save()
+
+    def unchanged(self, profile_url, fingerprint):
+        """True if the profile matches what was last written and can be skipped."""
+        if not self.enabled:
+            return False
+        stored = self.stored.get(profile_url)
+        if stored is None or stored[0] != fingerprint or time.time() - stored[1] > self.max_age:
+            return False
+        self.skipped += 1
+        print(f"Unchanged since last run, skipping: {profile_url}")
+        return True
+
+    def record(self, profile_url, fingerprint):
+        self.pending[profile_url] = fingerprint
+        self.save()
+
+    def save(self):
+        with open(pending_path(self.university), mode="w", encoding="utf-8") as f:
+            json.dump(self.pending, f)
+
+def confirm_fingerprints(university):
+    """
+    Moves the fingerprints recorded by the last scrape of a university into the
+    database. Called by the update pipeline once write_to_db has written the
+    university's CSV.
+    """
+    path = pending_path(university)
+    if not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8") as f:
+        pending = json.load(f)
+    now = time.time()
+    db = SessionLocal()
+    try:
+        existing = {
+            row.profile_url: row
+            for row in db.query(ProfileFingerprints).filter(ProfileFingerprints.university == university).all()
+        }
+        new_rows = []
+        for profile_url, fingerprint in pending.items():
+            row = existing.get(profile_url)
+            if row is None:
+                new_rows.append({"university": university, "profile_url": profile_url, "fingerprint": fingerprint, "checked_at": now})
+            else:
+                row.fingerprint = fingerprint
+                row.checked_at = now
+        if new_rows:
+            db.bulk_insert_mappings(ProfileFingerprints, new_rows)
+        db.commit()
+    finally:
+        db.close()
+    os.remove(path)
+    if pending:
+        print(f"Stored fingerprints for {len(pending)} scraped profiles")
+    return len(pending)
+
+def clear_fingerprints(db):
+    """
+    Forgets every stored and pending fingerprint, so the next scrape re-scrapes all
+    profiles. Needed whenever Researchers or Publications rows are removed wholesale,
+    or the profiles they came from would be skipped as unchanged.
+    """
+    db.query(ProfileFingerprints).delete()
+    for path in glob.glob(pending_path("*")):
+        os.remove(path)
@@ -0,0 +1,108 @@
+import re
+from functools import lru_cache
+
+import pandas as pd
+
+# Size of the job title and name caches; scraped CSVs repeat a few hundred distinct values
+NORMALIZE_CACHE_SIZE = 8192
+
+# Enhanced pattern to match titles in any order (e.g., "Professor Emeritus" or "Emeritus Professor")
+TITLE_PATTERN = re.compile(
+    r"^(Dr\.?|Associate Professor|Professor|Ms\.?|Mr\.?|Mrs\.?|Lecturer|Prof\.?|EmPr|AsPr"
+    r"|Scientia Professor|Professor Scientia|Emeritus Professor|Professor Emeritus|Emeritus)\s+",
+    re.IGNORECASE
+)
+
+# Blacklist certain role keywords
+TITLE_BLACKLIST = ["Education-Focused", "Education Focused", "Education Focussed", "Teaching-Focused", "Teaching Focused", "Teaching Focussed"]
+BLACKLIST_PATTERN = re.compile(r'\b(?:' + '|'.join(re.escape(term) for term in TITLE_BLACKLIST) + r')\b', re.IGNORECASE)
+
+# Define all possible forms and their canonical mapping
+JOB_TITLE_MAP = {
+    "Associate Lecturer": "Associate Lecturer",
+    "Lecturer (A)": "Associate Lecturer",
+    "Lecturer": "Lecturer",
+    "Fellow": "Fellow",
+    "FELLOW": "Fellow",
+    "Senior Lecturer": "Senior Lecturer",
+    "Senior Fellow": "Senior Fellow",
+    "Associate Professor": "Associate Professor",
+    "Associate Prof": "Associate Professor",
+    "AsPr": "Associate Professor",
+    "Professor": "Professor",
+    "PROFESSOR": "Professor",
+    "Prof": "Professor",
+    "Professorial Fellow": "Professorial Fellow",
+    "Professor Emeritus": "Professor Emeritus",
+    "Emeritus Professor": "Professor Emeritus",
+    "Emeritus": "Professor Emeritus"
+}
+# Sort by length so longer matches take priority
+JOB_TITLE_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(t) for t in sorted(JOB_TITLE_MAP, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE
+)
+
+ROLE_LEVEL_MAP = {
+    "Associate Lecturer": "A",
+    "Lecturer": "B",
+    "Fellow": "B",
+    "Senior Lecturer": "C",
+    "Senior Fellow": "C",
+    "Associate Professor": "D",
+    "Professor": "E",
+    "Professorial Fellow": "E",
+    "Professor Emeritus": "E",
+    "Exclude": None
+}
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_job_title(job_title, name=""):
+    """
+    Returns the canonical job title for a scraped job title, "Exclude" for
+    teaching/education focused roles, or None if no known title is found.
+    Falls back to a title in the researcher's name (e.g. "Professor Jane Doe").
+    """
+    if job_title and BLACKLIST_PATTERN.search(job_title):
+        return "Exclude"
+    match = JOB_TITLE_PATTERN.search(job_title or "") or JOB_TITLE_PATTERN.search(name or "")
+    if match:
+        raw = match.group()
+        return JOB_TITLE_MAP.get(raw, raw)  # map to canonical form
+    return None
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def clean_researcher_name(name):
+    """Strips honorifics and academic titles from the start of a researcher's name."""
+    return TITLE_PATTERN.sub("", name).strip() if name else name
+
+def role_level(job_title):
+    """Returns the level (A-E) for a canonical job title, or None."""
+    return ROLE_LEVEL_MAP.get(job_title) if job_title else None
+
+def clean_publication_type(type_val):
+    """Removes the trailing breadcrumb arrow the big 3 universities add to publication types."""
+    if type_val and type_val[-2:] == ' ›':
+        return type_val[:-2]
+    return type_val
+
+def normalize_researcher_columns(df, title_col="Job Title", name_col="Researcher Name"):
+    """
+    Normalizes the job title and researcher name columns of a scraped DataFrame
+    in one call and adds a "Level" column. Each distinct (job title, name) pair
+    is normalized once and the results are mapped back onto the frame.
+    Returns a new DataFrame.
+    """
+    df = df.copy()
+    raw = df[[title_col, name_col]].fillna("")
+    pairs = raw.drop_duplicates()
+    titles = pd.Series(
+        [normalize_job_title(title, name) for title, name in pairs.itertuples(index=False)],
+        index=pd.MultiIndex.from_frame(pairs),
+        dtype=object
+    )
+    titles = titles.reindex(pd.MultiIndex.from_frame(raw))
+    df[title_col] = titles.where(titles.notna(), None).to_numpy()
+    df["Level"] = df[title_col].map(role_level)
+    df[name_col] = raw[name_col].map(clean_researcher_name)
+    return df
@@ -0,0 +1,182 @@
+import json
+import os
+import threading
+import time
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.scrapers.helpers.page_cache import PageCache, PageCacheMiss
+
+OPENALEX_URL = os.getenv("OPENALEX_URL", "https://api.openalex.org")
+# Added to every request to get into OpenAlex's faster "polite pool"
+OPENALEX_EMAIL = os.getenv("OPENALEX_EMAIL")
+OPENALEX_TIMEOUT = 30
+OPENALEX_CACHE_DIR = "app/files/cache/openalex"
+# Responses older than this are fetched again
+OPENALEX_CACHE_TTL = 7 * 24 * 3600
+OPENALEX_CACHE_MAX_BYTES = 200 * 2**20
+# OpenAlex accepts up to 100 values in one OR filter (a|b|c); stay well under the URL length limit
+OPENALEX_BATCH_SIZE = 50
+OPENALEX_PER_PAGE = 200
+# OpenAlex allows 10 requests a second; keep some headroom for retries
+OPENALEX_RATE = 8
+
+# Only the fields the scrapers read, so responses stay small
+WORK_FIELDS = ["id", "display_name", "publication_date", "type", "doi", "primary_location", "authorships"]
+AUTHOR_FIELDS = ["id", "display_name"]
+INSTITUTION_FIELDS = ["id", "display_name"]
+
+def short_id(openalex_id):
+    """"https://openalex.org/A123" -> "A123"."""
+    return openalex_id.replace("https://openalex.org/", "") if openalex_id else openalex_id
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class RateLimiter:
+    """Spaces calls to wait() at least 1/rate seconds apart, across threads."""
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+class OpenAlexClient:
+    """
+    Thin OpenAlex API client for the scrapers. Every request asks only for the
+    fields it needs (select=), list queries follow cursor pagination to the end,
+    lookups for many IDs are sent as OR filters in batches, and responses are
+    cached on disk for OPENALEX_CACHE_TTL so re-runs don't repeat them.
+    Safe to share between threads; requests are spaced out to OPENALEX_RATE a second.
+    """
+    def __init__(self, base_url=OPENALEX_URL, email=OPENALEX_EMAIL, cache=None, rate=OPENALEX_RATE):
+        self.base_url = base_url.rstrip("/")
+        self.email = email
+        self.cache = cache if cache is not None else PageCache(
+            path=OPENALEX_CACHE_DIR, ttl=OPENALEX_CACHE_TTL, max_bytes=OPENALEX_CACHE_MAX_BYTES
+        )
+        self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.limiter = RateLimiter(rate)
+        self.requests = 0
+        self._count_lock = threading.Lock()
+
+    def _get(self, path, params):
+        params = dict(params)
+        if self.email:
+            params["mailto"] = self.email
+        self.limiter.wait()
+        response = self.session.get(f"{self.base_url}/{path}", params=params, timeout=OPENALEX_TIMEOUT)
+        with self._count_lock:
+            self.requests += 1
+        response.raise_for_status()
+        return response.json()
+
+    def _cached(self, path, params, fetch):
+        """Returns the cached result for this query, or fetch()es and caches it."""
+        key = f"{path}?{urlencode(sorted(params.items()))}"
+        body = self.cache.get(key)
+        if body is not None:
+            return json.loads(body)
+        if self.cache.replaying:
+            raise PageCacheMiss(key)
+        result = fetch()
+        self.cache.put(key, json.dumps(result), namespace=path)
+        return result
+
+    def get_one(self, path, openalex_id, select=None):
+        """Fetches a single entity, e.g. get_one("works", "W123")."""
+        params = {"select": ",".join(select)} if select else {}
+        return self._cached(f"{path}/{openalex_id}", params, lambda: self._get(f"{path}/{openalex_id}", params))
+
+    def get_all(self, path, filter=None, search=None, select=None, per_page=OPENALEX_PER_PAGE):
+        """Returns every result of a list query, following the cursor through all its pages."""
+        params = {"per-page": per_page}
+        if filter:
+            params["filter"] = filter
+        if search:
+            params["search"] = search
+        if select:
+            params["select"] = ",".join(select)
+
+        def fetch():
+            results = []
+            cursor = "*"
+            while cursor:
+                page = self._get(path, {**params, "cursor": cursor})
+                results.extend(page["results"])
+                cursor = page["meta"].get("next_cursor") if page["results"] else None
+            return results
+        return self._cached(path, params, fetch)
+
+    def search(self, path, query, filter=None, select=None, limit=25):
+        """Returns the first `limit` results of a search, best match first."""
+        params = {"search": query, "per-page": limit}
+        if filter:
+            params["filter"] = filter
+        if select:
+            params["select"] = ",".join(select)
+        return self._cached(path, params, lambda: self._get(path, params)["results"])
+
+    def institution_id(self, name):
+        """Short ID of the best match for an institution name, or None."""
+        institutions = self.search("institutions", name, select=INSTITUTION_FIELDS, limit=1)
+        return short_id(institutions[0]["id"]) if institutions else None
+
+    def search_authors(self, name, institution_id=None):
+        filter = f"affiliations.institution.id:{institution_id}" if institution_id else None
+        return self.search("authors", name, filter=filter, select=AUTHOR_FIELDS)
+
+    def get_works(self, work_ids, select=WORK_FIELDS):
+        """Fetches many works by ID with one request per OPENALEX_BATCH_SIZE IDs. Returns {short id: work}."""
+        works = {}
+        for batch in chunked(sorted(set(work_ids)), OPENALEX_BATCH_SIZE):
+            for work in self.get_all("works", filter=f"openalex:{'|'.join(batch)}", select=select):
+                works[short_id(work["id"])] = work
+        return works
+
+    def works_by_authors(self, author_ids, select=WORK_FIELDS):
+        """
+        Fetches the works of many authors with one paginated query per
+        OPENALEX_BATCH_SIZE authors. Returns {short author id: [works]}, with each
+        author's works in the order OpenAlex returned them. A work shared by several
+        of the authors is listed under each of them. (List responses cut authorships
+        off after 100 authors, which doesn't matter for business school papers.)
+        """
+        wanted = list(dict.fromkeys(author_ids))
+        by_author = {author_id: [] for author_id in wanted}
+        for batch in chunked(wanted, OPENALEX_BATCH_SIZE):
+            batch_ids = set(batch)
+            for work in self.get_all("works", filter=f"author.id:{'|'.join(batch)}", select=select):
+                seen = set()
+                for authorship in work.get("authorships") or []:
+                    author_id = short_id((authorship.get("author") or {}).get("id"))
+                    if author_id in batch_ids and author_id not in seen:
+                        seen.add(author_id)
+                        by_author[author_id].append(work)
+        return by_author
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_openalex_client():
+    """Returns the shared OpenAlex client, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OpenAlexClient()
+        return _client
@@ -0,0 +1,192 @@
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+PAGE_CACHE_DIR = "app/files/cache/pages"
+# Pages older than this are fetched again
+PAGE_CACHE_TTL = 7 * 24 * 3600
+# Compressed bytes kept on disk before the least recently used pages are evicted
+PAGE_CACHE_MAX_BYTES = 500 * 2**20
+
+# "on": use pages younger than the TTL, fetch and store the rest
+# "refresh": always fetch, but store what was fetched
+# "replay": only use stored pages, whatever their age, and never fetch
+# "off": bypass the cache
+CACHE_MODES = ("on", "refresh", "replay", "off")
+
+class PageCacheMiss(LookupError):
+    """Raised in replay mode when a page was never stored."""
+
+class PageCache:
+    """
+    On-disk cache of fetched pages. Bodies are gzipped and stored once under their
+    SHA-256, and a SQLite index maps each key (normally the URL) to its body, the
+    time it was fetched and the time it was last used.
+    """
+    def __init__(self, path=PAGE_CACHE_DIR, ttl=PAGE_CACHE_TTL, max_bytes=PAGE_CACHE_MAX_BYTES, mode=None):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.mode = mode or os.getenv("SCRAPER_CACHE", "on")
+        if self.mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode {self.mode!r}, expected one of {CACHE_MODES}")
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(self.path, "objects"), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "key TEXT PRIMARY KEY, namespace TEXT, meta TEXT, digest TEXT NOT NULL, "
+                "size INTEGER NOT NULL, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_pages_namespace ON pages (namespace)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_pages_accessed_at ON pages (accessed_at)")
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    @contextmanager
+    def _connect(self):
+        """Opens the index for one operation, committing (or rolling back) and closing it afterwards."""
+        conn = sqlite3.connect(os.path.join(self.path, "index.db"), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _object_path(self, digest):
+        return os.path.join(self.path, "objects", digest[:2], f"{digest}.gz")
+
+    def _read(self, digest):
+        try:
+            with gzip.open(self._object_path(digest), "rt", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def get(self, key):
+        """Returns the stored page for key, or None if it is missing, expired or the cache is bypassed."""
+        if self.mode in ("off", "refresh"):
+            return None
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT digest, fetched_at FROM pages WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            digest, fetched_at = row
+            if not self.replaying and time.time() - fetched_at > self.ttl:
+                return None
+            conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return self._read(digest)
+
+    def put(self, key, body, namespace=None, meta=None):
+        """Stores body under key, replacing any older copy, then evicts down to max_bytes."""
+        if self.mode in ("off", "replay") or body is None:
+            return
+        data = body.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self._object_path(digest)
+        with self._lock:
+            if not os.path.exists(object_path):
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                tmp_path = f"{object_path}.{threading.get_ident()}.tmp"
+                with gzip.open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, object_path)
+            size = os.path.getsize(object_path)
+            now = time.time()
+            with self._connect() as conn:
+                old = conn.execute("SELECT digest FROM pages WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages (key, namespace, meta, digest, size, fetched_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, namespace, json.dumps(meta) if meta is not None else None, digest, size, now, now)
+                )
+                if old and old[0] != digest:
+                    self._drop_unreferenced(conn, [old[0]])
+                self._evict(conn)
+
+    def entries(self, namespace):
+        """Yields (key, meta, body) for every stored page in a namespace, ordered by key."""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT key, meta, digest FROM pages WHERE namespace = ? ORDER BY key", (namespace,)
+            ).fetchall()
+        for key, meta, digest in rows:
+            body = self._read(digest)
+            if body is not None:
+                yield key, json.loads(meta) if meta else {}, body
+
+    def total_bytes(self, conn):
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM pages)").fetchone()[0]
+
+    def _evict(self, conn):
+        """Removes least recently used pages until the stored bodies fit in max_bytes."""
+        total = self.total_bytes(conn)
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, digest, size in conn.execute("SELECT key, digest, size FROM pages ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+            evicted.append(digest)
+            # A body shared with another key still takes up space until that key goes too
+            if not conn.execute("SELECT 1 FROM pages WHERE digest = ?", (digest,)).fetchone():
+                total -= size
+        self._drop_unreferenced(conn, evicted)
+
+    def _drop_unreferenced(self, conn, digests):
+        for digest in set(digests):
+            if conn.execute("SELECT 1 FROM pages WHERE digest = ?", (digest,)).fetchone():
+                continue
+            try:
+                os.remove(self._object_path(digest))
+            except OSError:
+                pass
+
+    def purge_expired(self):
+        """Deletes pages older than the TTL. Returns how many were removed."""
+        cutoff = time.time() - self.ttl
+        with self._lock, self._connect() as conn:
+            digests = [d for (d,) in conn.execute("SELECT digest FROM pages WHERE fetched_at < ?", (cutoff,))]
+            conn.execute("DELETE FROM pages WHERE fetched_at < ?", (cutoff,))
+            self._drop_unreferenced(conn, digests)
+        return len(digests)
+
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+def get_page_cache():
+    """Returns the shared page cache, created on first use."""
+    global _page_cache
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = PageCache()
+        return _page_cache
+
+def set_page_cache_mode(mode):
+    """Switches the shared cache between "on", "refresh", "replay" and "off"."""
+    if mode not in CACHE_MODES:
+        raise ValueError(f"Unknown cache mode {mode!r}, expected one of {CACHE_MODES}")
+    get_page_cache().mode = mode
+
+def cached_page(key, fetch, namespace=None, meta=None):
+    """
+    Returns the cached page for key, or calls fetch() and caches what it returns.
+    In replay mode a missing page raises PageCacheMiss instead of fetching.
+    """
+    cache = get_page_cache()
+    body = cache.get(key)
+    if body is not None:
+        return body
+    if cache.replaying:
+        raise PageCacheMiss(key)
+    body = fetch()
+    cache.put(key, body, namespace, meta)
+    return body
@@ -3,54 +3,535 @@ from app.models import Researchers, Publications
 import csv
 import re
 import os
-from app.models import Researchers, Publications, Journals
-from fuzzywuzzy import process
-import csv
+from urllib.parse import unquote
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from app.models import Researchers, Publications, Journals, JournalMatches, JournalRankings
+from rapidfuzz import process as rf_process, fuzz as rf_fuzz, utils as rf_utils
+import numpy as np
+from app.scrapers.helpers.normalize import normalize_job_title, clean_researcher_name, role_level, clean_publication_type
+
+# Number of distinct journal names scored per cdist call
+MATCH_CHUNK_SIZE = 1000
+# Scraped CSV rows standardized and written per transaction; keeps IN lists under SQLite's parameter limit
+WRITE_CHUNK_SIZE = 500
+# Journals considered per name when scoring through the trigram index
+MATCH_CANDIDATES = 100
+# Journal names (and trigram index) held by each matching worker process, set once by _init_match_worker
+_worker_journal_names = None
+_worker_journal_index = None
+# Trigram index over Journals.name, reused until the journal table changes
+_journal_index_cache = {"signature": None, "index": None}
+
+_NON_WORD_PATTERN = re.compile(r"[\W_]+")
+_LEADING_THE_PATTERN = re.compile(r"^the\s+")
+_ISSN_PATTERN = re.compile(r"\d{7}[\dX]")
+_DOI_PATTERN = re.compile(r"10\.\d{4,9}/[^\s?#]+")
+_DOI_EMBEDDED_ISSN_PATTERN = re.compile(r"^(?:s|j\.)(\d{4}-?\d{3}[\dx])(?:[(.]|$)")
+_DOI_JOURNAL_PREFIX_PATTERN = re.compile(r"^(10\.\d{4,9}/(?:j\.)?(?!j\.)[a-z][a-z0-9]*)[.\-(_]")
+# Repository and aggregator DOIs (SSRN, arXiv, Zenodo, figshare, Informit) do not identify a journal
+_DOI_REPOSITORY_PREFIXES = {"10.2139/ssrn", "10.48550/arxiv", "10.5281/zenodo", "10.6084/m9", "10.3316/informit"}
 
-def match_journals(threshold=95, force=False, university="all"):
+def match_journals(threshold=95, force=False, university="all", workers=None):
+    """
+    Matches publications against the Journals table and sets journal_id.
+    Publications with an ISSN (stored, or derived from a DOI in their URL) are
+    joined on the ISSN/eISSN map first. The rest are grouped by distinct journal
+    name and looked up in a normalized-name index, then in the persisted
+    JournalMatches cache; only names never seen before are scored against all
+    journal names they share the most trigrams with and added to the cache. Publications
+    still unmatched are resolved through DOI prefixes learned from matched ones.
+    Results are written back with a single bulk update.
+    A publication is fuzzy matched when its best score is at least `threshold`.
+    With `workers` > 1 the names to score are sharded across that many processes.
+    Returns a dict of match statistics.
+    """
     print("Matching Journal Names With ABDC Rankings")
     db = SessionLocal()
     try:
-        journals = db.query(Journals).all()
-        journal_names = [j.name for j in journals]
-        journal_dict = {j.name: j for j in journals}
-        query = db.query(Publications)
-        if university != "all":
-            query = query.join(Researchers).filter(Researchers.university == university)
-        publications = query.all()
-        total = len(publications)
-        print(f"Total publications to process: {total}")
-        progress_bar_len = 40
-
         # If force=True, reset all Publications.journal_id to None
         if force:
             print("Resetting all Publications.journal_id to None")
-            db.query(Publications).update({Publications.journal_id: None})
+            db.query(Publications).update({Publications.journal_id: None, Publications.abdc_rank_at_publication: None})
             db.commit()
 
-        def print_progress(count, total):
-            filled_len = int(progress_bar_len * count // total)
-            bar = '=' * filled_len + '-' * (progress_bar_len - filled_len)
-            print(f"\r[{bar}] {count}/{total}", end='', flush=True)
+        journals = db.query(Journals.id, Journals.name, Journals.ISSN, Journals.eISSN).all()
+        journal_ids = [j.id for j in journals]
+        journal_names = [j.name for j in journals]
 
-        for idx, pub in enumerate(publications, 1):
-            if pub.journal_id:
-                print_progress(idx, total)
-                continue
-            if not pub.journal_name:
-                print_progress(idx, total)
-                continue
-            match, score = process.extractOne(pub.journal_name, journal_names)
-            if score >= threshold:
-                matched_journal = journal_dict.get(match)
-                if matched_journal:
-                    pub.journal_id = matched_journal.id
-            print_progress(idx, total)
+        query = db.query(
+            Publications.id, Publications.journal_name, Publications.issn, Publications.publication_url
+        ).filter(Publications.journal_id.is_(None))
+        if university != "all":
+            query = query.join(Researchers, Publications.researcher_id == Researchers.id).filter(Researchers.university == university)
+        publications = query.all()
+        stats = {
+            "publications": len(publications), "issn_hits": 0, "names": 0, "index_hits": 0,
+            "cache_hits": 0, "fuzzy_scored": 0, "doi_prefix_hits": 0, "matched_publications": 0
+        }
+        print(f"Total publications to process: {len(publications)}")
+        if not publications or not journals:
+            return stats
+
+        # First pass: deterministic join on ISSN/eISSN
+        issn_index = build_journal_issn_index(journals)
+        matched_pubs = {}
+        pub_ids_by_name = {}
+        for pub in publications:
+            issn = normalize_issn(pub.issn) or issn_from_doi(extract_doi(pub.publication_url))
+            journal_id = issn_index.get(issn) if issn else None
+            if journal_id is not None:
+                matched_pubs[pub.id] = journal_id
+            elif pub.journal_name:
+                # Group publications by journal name so each distinct name is only scored once
+                pub_ids_by_name.setdefault(pub.journal_name, []).append(pub.id)
+        stats["issn_hits"] = len(matched_pubs)
+        print(f"ISSN index resolved {len(matched_pubs)}/{len(publications)} publications")
+
+        names = list(pub_ids_by_name)
+        stats["names"] = len(names)
+        print(f"Distinct journal names to match: {len(names)}")
+
+        # Second pass: exact lookups on the normalized journal name
+        name_index = build_journal_name_index([(j.id, j.name) for j in journals])
+        matched = {}
+        leftovers = []
+        for name in names:
+            journal_id = name_index.get(normalize_journal_name(name))
+            if journal_id is not None:
+                matched[name] = journal_id
+            else:
+                leftovers.append(name)
+        stats["index_hits"] = len(matched)
+        if names:
+            print(f"Normalized name index resolved {len(matched)}/{len(names)} names ({len(matched) / len(names):.1%} hit rate)")
+
+        # Third pass: reuse cached fuzzy results and only score names never seen before
+        cache = {
+            m.journal_name: (m.journal_id, m.score)
+            for m in db.query(JournalMatches.journal_name, JournalMatches.journal_id, JournalMatches.score)
+        }
+        unseen = [name for name in leftovers if name not in cache]
+        stats["cache_hits"] = len(leftovers) - len(unseen)
+        stats["fuzzy_scored"] = len(unseen)
+        print(f"Journal match cache resolved {stats['cache_hits']}/{len(leftovers)} remaining names")
+        if unseen:
+            index = get_journal_trigram_index([(j.id, j.name) for j in journals])
+            scores = score_journal_names(unseen, journal_names, progress=True, processes=workers, index=index)
+            new_entries = []
+            for name, (best_idx, score) in zip(unseen, scores):
+                cache[name] = (journal_ids[best_idx], score)
+                new_entries.append({"journal_name": name, "journal_id": journal_ids[best_idx], "score": score})
+            db.bulk_insert_mappings(JournalMatches, new_entries)
+        for name in leftovers:
+            journal_id, score = cache[name]
+            if journal_id is not None and score is not None and score >= threshold:
+                matched[name] = journal_id
+
+        for name, journal_id in matched.items():
+            for pub_id in pub_ids_by_name[name]:
+                matched_pubs[pub_id] = journal_id
+
+        # Last pass: DOI prefixes that consistently belong to one journal
+        unmatched = [pub for pub in publications if pub.id not in matched_pubs and pub.publication_url]
+        if unmatched:
+            prefix_index = build_doi_prefix_index(db, matched_pubs, publications)
+            for pub in unmatched:
+                journal_id = prefix_index.get(doi_journal_prefix(extract_doi(pub.publication_url)))
+                if journal_id is not None:
+                    matched_pubs[pub.id] = journal_id
+                    stats["doi_prefix_hits"] += 1
+            print(f"DOI prefixes resolved {stats['doi_prefix_hits']}/{len(unmatched)} remaining publications")
+
+        mappings = [{"id": pub_id, "journal_id": journal_id} for pub_id, journal_id in matched_pubs.items()]
+        db.bulk_update_mappings(Publications, mappings)
+        update_publication_ranks(db, list(matched_pubs))
         db.commit()
-        print()  # Move to next line after progress bar
+        stats["matched_publications"] = len(mappings)
+        print(f"Matched {len(mappings)} publications")
+        return stats
     finally:
         db.close()
 
+def invalidate_journal_match_cache(db, removed_ids=(), added_journals=()):
+    """
+    Updates the JournalMatches cache after the journal list changes.
+    Entries pointing at removed (or renamed) journals are deleted so they are matched
+    again on the next run, and imperfect entries are rescored against the added
+    journals only. `added_journals` is a list of (id, name) rows. The caller commits.
+    Returns the names whose cached match moved to one of the added journals.
+    """
+    removed_ids = list(removed_ids)
+    added_journals = list(added_journals)
+    if removed_ids:
+        deleted = (
+            db.query(JournalMatches)
+            .filter(JournalMatches.journal_id.in_(removed_ids))
+            .delete(synchronize_session=False)
+        )
+        print(f"Invalidated {deleted} cached journal matches for removed journals")
+    if not added_journals:
+        return []
+    entries = (
+        db.query(JournalMatches.id, JournalMatches.journal_name, JournalMatches.score)
+        .filter(JournalMatches.score < 100)
+        .all()
+    )
+    if not entries:
+        return []
+    added_ids = [journal_id for journal_id, _ in added_journals]
+    added_names = [name for _, name in added_journals]
+    scores = score_journal_names([e.journal_name for e in entries], added_names)
+    mappings = []
+    changed_names = []
+    for e, (best_idx, score) in zip(entries, scores):
+        if score > e.score:
+            mappings.append({"id": e.id, "journal_id": added_ids[best_idx], "score": score})
+            changed_names.append(e.journal_name)
+    db.bulk_update_mappings(JournalMatches, mappings)
+    print(f"Updated {len(mappings)} cached journal matches for {len(added_ids)} added journals")
+    return changed_names
+
+def normalize_issn(value):
+    """Returns an ISSN as 8 upper-case characters without the hyphen, or None if it is not a valid ISSN."""
+    if value is None:
+        return None
+    issn = str(value).strip().upper().replace("-", "")
+    return issn if _ISSN_PATTERN.fullmatch(issn) else None
+
+def normalize_journal_name(name):
+    """
+    Reduces a journal name to a lookup key that ignores case, punctuation,
+    a leading "The" and "&" vs "and".
+    """
+    key = (name or "").lower().replace("&", " and ")
+    key = _NON_WORD_PATTERN.sub(" ", key).strip()
+    return _LEADING_THE_PATTERN.sub("", key)
+
+def build_journal_name_index(journals):
+    """
+    Builds a normalized name -> journal id index from (id, name) rows.
+    Keys shared by more than one journal are left out so the fuzzy pass decides them.
+    """
+    index = {}
+    ambiguous = set()
+    for journal_id, name in journals:
+        key = normalize_journal_name(name)
+        if not key or key in ambiguous:
+            continue
+        if key in index and index[key] != journal_id:
+            del index[key]
+            ambiguous.add(key)
+            continue
+        index[key] = journal_id
+    return index
+
+def build_journal_issn_index(journals):
+    """
+    Builds a normalized ISSN -> journal id index over the ISSN and eISSN of each
+    journal row. ISSNs listed under more than one journal are left out.
+    """
+    index = {}
+    ambiguous = set()
+    for j in journals:
+        for issn in {normalize_issn(j.ISSN), normalize_issn(j.eISSN)}:
+            if not issn or issn in ambiguous:
+                continue
+            if issn in index and index[issn] != j.id:
+                del index[issn]
+                ambiguous.add(issn)
+                continue
+            index[issn] = j.id
+    return index
+
+def link_journal_rankings(db):
+    """
+    Points each JournalRankings row at the current Journals row with the same
+    ISSN/eISSN, or failing that the same normalized title. Run after the
+    Journals table changes so historical editions follow renamed journals.
+    """
+    journals = db.query(Journals.id, Journals.name, Journals.ISSN, Journals.eISSN).all()
+    issn_index = build_journal_issn_index(journals)
+    name_index = build_journal_name_index([(j.id, j.name) for j in journals])
+    mappings = []
+    for row in db.query(JournalRankings.id, JournalRankings.title, JournalRankings.ISSN, JournalRankings.eISSN, JournalRankings.journal_id):
+        journal_id = issn_index.get(normalize_issn(row.ISSN)) or issn_index.get(normalize_issn(row.eISSN))
+        if journal_id is None:
+            journal_id = name_index.get(normalize_journal_name(row.title))
+        if journal_id != row.journal_id:
+            mappings.append({"id": row.id, "journal_id": journal_id})
+    db.bulk_update_mappings(JournalRankings, mappings)
+    return len(mappings)
+
+def edition_in_force(editions, year):
+    """
+    Returns the JQL edition in force in `year` from a sorted list of edition years:
+    the latest one published in or before that year, or the earliest edition for
+    publications older than every list.
+    """
+    in_force = editions[0]
+    for edition in editions:
+        if edition > year:
+            break
+        in_force = edition
+    return in_force
+
+def update_publication_ranks(db, publication_ids=None):
+    """
+    Precomputes Publications.abdc_rank_at_publication from the JQL edition in
+    force in each publication's year. Publications without a year, or matched to
+    a journal missing from every loaded edition, get the journal's current rank.
+    Only the given publications are updated when `publication_ids` is passed.
+    Does not commit.
+    """
+    ranks_by_journal = {}
+    for row in db.query(JournalRankings.journal_id, JournalRankings.edition, JournalRankings.abdc_rank).filter(JournalRankings.journal_id.isnot(None)):
+        ranks_by_journal.setdefault(row.journal_id, {})[row.edition] = row.abdc_rank
+    editions = sorted({row.edition for row in db.query(JournalRankings.edition).distinct()})
+    current_ranks = dict(db.query(Journals.id, Journals.abdc_rank))
+
+    query = db.query(Publications.id, Publications.year, Publications.journal_id, Publications.abdc_rank_at_publication)
+    if publication_ids is None:
+        publications = query.all()
+    else:
+        # Chunk the IN clause to stay under SQLite's bound parameter limit
+        publication_ids = list(publication_ids)
+        publications = []
+        for start in range(0, len(publication_ids), MATCH_CHUNK_SIZE):
+            publications.extend(query.filter(Publications.id.in_(publication_ids[start:start + MATCH_CHUNK_SIZE])).all())
+    mappings = []
+    for pub in publications:
+        rank = None
+        if pub.journal_id is not None:
+            journal_ranks = ranks_by_journal.get(pub.journal_id)
+            if pub.year is None or not journal_ranks:
+                rank = current_ranks.get(pub.journal_id)
+            else:
+                rank = journal_ranks.get(edition_in_force(editions, pub.year))
+        if rank != pub.abdc_rank_at_publication:
+            mappings.append({"id": pub.id, "abdc_rank_at_publication": rank})
+    db.bulk_update_mappings(Publications, mappings)
+    return len(mappings)
+
+def extract_doi(url):
+    """Returns the DOI contained in a publication URL (e.g. a doi.org link), or None."""
+    if not url:
+        return None
+    match = _DOI_PATTERN.search(unquote(url))
+    return match.group(0).rstrip(".").lower() if match else None
+
+def issn_from_doi(doi):
+    """
+    Derives the journal ISSN from DOIs that embed it: Taylor & Francis
+    (10.1080/{ISSN}...), SAGE (10.1177/{ISSN}...) and Cambridge (10.1017/S{ISSN}...)
+    DOIs, and the older Elsevier (S{ISSN}(...)) and Wiley (j.{ISSN}...) formats.
+    Only ISSNs with a valid check digit are returned.
+    """
+    if not doi:
+        return None
+    prefix, _, suffix = doi.partition("/")
+    candidates = []
+    if prefix in ("10.1080", "10.1177"):
+        candidates.append(suffix[:8])
+    elif prefix == "10.1017" and suffix.startswith("s"):
+        # Cambridge: S{ISSN}{year}...
+        candidates.append(suffix[1:9])
+    match = _DOI_EMBEDDED_ISSN_PATTERN.match(suffix)
+    if match:
+        candidates.append(match.group(1))
+    for candidate in candidates:
+        issn = normalize_issn(candidate)
+        if issn and _issn_check_digit(issn[:7]) == issn[7]:
+            return issn
+    return None
+
+def doi_journal_prefix(doi):
+    """
+    Returns the journal specific part of a DOI, e.g. "10.1016/j.jcorpfin" for
+    10.1016/j.jcorpfin.2019.101536 or "10.1111/acfi" for 10.1111/acfi.12797.
+    """
+    if not doi:
+        return None
+    match = _DOI_JOURNAL_PREFIX_PATTERN.match(doi)
+    return match.group(1) if match else None
+
+def build_doi_prefix_index(db, matched_pubs, publications):
+    """
+    Learns a DOI journal prefix -> journal id table from publications that are
+    already matched, including the matches made in the current run.
+    Only prefixes seen at least twice and always with the same journal are kept,
+    and repository prefixes that host many journals' papers are ignored.
+    """
+    urls = {pub.id: pub.publication_url for pub in publications}
+    rows = [(urls[pub_id], journal_id) for pub_id, journal_id in matched_pubs.items()]
+    rows.extend(
+        db.query(Publications.publication_url, Publications.journal_id)
+        .filter(Publications.journal_id.isnot(None), Publications.publication_url.isnot(None))
+        .all()
+    )
+    seen = {}
+    for url, journal_id in rows:
+        prefix = doi_journal_prefix(extract_doi(url))
+        if prefix and prefix not in _DOI_REPOSITORY_PREFIXES:
+            seen.setdefault(prefix, []).append(journal_id)
+    return {
+        prefix: journal_ids[0]
+        for prefix, journal_ids in seen.items()
+        if len(journal_ids) >= 2 and len(set(journal_ids)) == 1
+    }
+
+def _issn_check_digit(digits):
+    total = sum(int(d) * weight for d, weight in zip(digits, range(8, 1, -1)))
+    check = (11 - total % 11) % 11
+    return "X" if check == 10 else str(check)
+
+def score_journal_names(names, journal_names, chunk_size=MATCH_CHUNK_SIZE, workers=-1, progress=False, processes=None, index=None):
+    """
+    Scores each name against every journal name and returns a list of
+    (best_index, best_score) tuples aligned with `names`.
+    Uses the same scorer as fuzzywuzzy's process.extractOne (WRatio on fully
+    processed strings, rounded to an integer), computed as a score matrix
+    with rapidfuzz's cdist across all cores. Names are scored in chunks to
+    keep the matrix size bounded.
+    When a JournalTrigramIndex is given, each name is only scored against the
+    candidates it returns instead of every journal name.
+    With `processes` > 1 the chunks are scored in a process pool instead; each
+    worker receives the journal names once when it starts.
+    """
+    progress_bar_len = 40
+    total = len(names)
+
+    def print_progress(count, total):
+        filled_len = int(progress_bar_len * count // total)
+        bar = '=' * filled_len + '-' * (progress_bar_len - filled_len)
+        print(f"\r[{bar}] {count}/{total}", end='', flush=True)
+
+    chunks = [names[start:start + chunk_size] for start in range(0, total, chunk_size)]
+    results = []
+    if processes and processes > 1 and total:
+        # Smaller shards keep every worker busy until the end of the run
+        shard_size = max(1, min(chunk_size, -(-total // (processes * 4))))
+        chunks = [names[start:start + shard_size] for start in range(0, total, shard_size)]
+        print(f"Scoring {total} journal names across {processes} worker processes")
+        # Spawn rather than fork, matching may be started from a web server thread
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_match_worker,
+            initargs=(journal_names, index)
+        ) as executor:
+            for chunk_results in executor.map(_score_journal_shard, chunks):
+                results.extend(chunk_results)
+                if progress:
+                    print_progress(len(results), total)
+    else:
+        for chunk in chunks:
+            results.extend(_score_chunk(chunk, journal_names, workers, index))
+            if progress:
+                print_progress(len(results), total)
+    if progress and total:
+        print()  # Move to next line after progress bar
+    return results
+
+def _score_chunk(chunk, journal_names, workers=-1, index=None):
+    if index is not None:
+        return [index.best_match(name) for name in chunk]
+    matrix = rf_process.cdist(
+        chunk,
+        journal_names,
+        scorer=rf_fuzz.WRatio,
+        processor=rf_utils.default_process,
+        dtype=np.uint8,
+        workers=workers
+    )
+    best = matrix.argmax(axis=1)
+    best_scores = matrix[np.arange(len(chunk)), best]
+    return list(zip(best.tolist(), best_scores.tolist()))
+
+def _init_match_worker(journal_names, index=None):
+    global _worker_journal_names, _worker_journal_index
+    _worker_journal_names = journal_names
+    _worker_journal_index = index
+
+def _score_journal_shard(chunk):
+    # Each process already scores its own shard, so cdist runs single-threaded here
+    return _score_chunk(chunk, _worker_journal_names, workers=1, index=_worker_journal_index)
+
+def name_trigrams(name):
+    """
+    Returns the set of character trigrams of a name after rapidfuzz's default
+    processing, padded so word starts and ends form their own trigrams.
+    """
+    processed = f" {rf_utils.default_process(name)} "
+    return {processed[i:i + 3] for i in range(len(processed) - 2)}
+
+class JournalTrigramIndex:
+    """
+    Inverted index from character trigrams to journal positions.
+    Candidates for a name are the journals sharing the most trigrams with it,
+    weighted by inverse document frequency so grams common to most titles
+    ("journal", "of") count for little. Only these candidates get a WRatio score.
+    """
+    def __init__(self, journal_names, candidates=MATCH_CANDIDATES):
+        self.journal_names = list(journal_names)
+        self.candidates = candidates
+        postings = {}
+        for position, name in enumerate(self.journal_names):
+            for gram in name_trigrams(name or ""):
+                postings.setdefault(gram, []).append(position)
+        total = max(len(self.journal_names), 1)
+        self.postings = {gram: np.array(positions, dtype=np.int32) for gram, positions in postings.items()}
+        self.weights = {gram: np.log(total / len(positions)) + 1.0 for gram, positions in postings.items()}
+
+    def candidate_positions(self, name):
+        """Returns the positions of the top candidate journals for a name, in table order."""
+        grams = [gram for gram in name_trigrams(name) if gram in self.postings]
+        if not grams:
+            return np.array([], dtype=np.int32)
+        positions = np.concatenate([self.postings[gram] for gram in grams])
+        weights = np.concatenate([np.full(len(self.postings[gram]), self.weights[gram]) for gram in grams])
+        overlap = np.bincount(positions, weights=weights, minlength=len(self.journal_names))
+        shared = np.flatnonzero(overlap)
+        if len(shared) > self.candidates:
+            shared = shared[np.argpartition(overlap[shared], -self.candidates)[-self.candidates:]]
+        return np.sort(shared)
+
+    def best_match(self, name):
+        """
+        Returns (best_index, best_score) for a name, scored like score_journal_names
+        but against the candidate journals only. Ties go to the earliest journal.
+        """
+        positions = self.candidate_positions(name)
+        if not len(positions):
+            return 0, 0
+        scores = rf_process.cdist(
+            [name],
+            [self.journal_names[i] for i in positions],
+            scorer=rf_fuzz.WRatio,
+            processor=rf_utils.default_process,
+            dtype=np.uint8,
+            workers=1
+        )[0]
+        best = int(scores.argmax())
+        return int(positions[best]), int(scores[best])
+
+def get_journal_trigram_index(journals):
+    """
+    Returns the trigram index for the given (id, name) journal rows, rebuilding
+    it only when the journal table has changed since the last call.
+    """
+    signature = hash(tuple(journals))
+    if _journal_index_cache["signature"] != signature:
+        print("Building journal trigram index")
+        _journal_index_cache["index"] = JournalTrigramIndex([name for _, name in journals])
+        _journal_index_cache["signature"] = signature
+    return _journal_index_cache["index"]
+
+def clear_journal_trigram_index():
+    """Drops the cached trigram index so the next match rebuilds it."""
+    _journal_index_cache["signature"] = None
+    _journal_index_cache["index"] = None
+
 # # Rapidfuzz Implementation by Frank
 # def rank_lookup(journal: Optional[str], names: List[str], ranks: List[str]) -> Optional[str]:
 #     """Return the ranking string for the given journal, if matched; else None."""
@@ -71,14 +552,47 @@ def match_journals(threshold=95, force=False, university="all"):
 #             return ranks[i]
 #     return None
 
-def write_to_db(university):
+def write_to_db(university, chunk_size=WRITE_CHUNK_SIZE, progress_callback=None, csv_path=None):
+    """
+    Writes a university's scraped CSV (app/files/temp/<university>_data.csv unless
+    csv_path is given) to the Researchers and Publications tables.
+    Rows are streamed from the CSV and standardized, deduplicated and written in
+    chunks of `chunk_size`, with one transaction per chunk, so memory stays
+    bounded by the chunk size rather than the CSV size.
+    progress_callback(rows_done, total_rows) is called after each chunk.
+    """
     print(f"Writing {university} data to database")
-    csv_path = f"app/files/temp/{university}_data.csv"
-    all_data = []
+    csv_path = csv_path or f"app/files/temp/{university}_data.csv"
+    total_rows = count_scraped_rows(csv_path)
+    rows_done = 0
+    totals = {"researchers": 0, "publications": 0, "updated_researchers": 0}
+    db = SessionLocal()
+    try:
+        for chunk in iter_chunks(read_scraped_rows(csv_path), chunk_size):
+            standardize(chunk) #standardize adds the Level field at index 9 (ISSN moves to index 10)
+            counts = write_chunk(db, university, chunk)
+            db.commit()
+            for key, value in counts.items():
+                totals[key] += value
+            rows_done += len(chunk)
+            print(f"Wrote {rows_done}/{total_rows} rows")
+            if progress_callback:
+                progress_callback(rows_done, total_rows)
+        print(f"Added {totals['researchers']} researchers, {totals['publications']} publications; updated {totals['updated_researchers']} researchers")
+    finally:
+        db.close()
+        print("Completed writing to database")
+
+def count_scraped_rows(csv_path):
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        return sum(1 for _ in csv.DictReader(f))
+
+def read_scraped_rows(csv_path):
+    """Yields each row of a scraped CSV in the list layout standardize() expects."""
     with open(csv_path, newline='', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            all_data.append([
+            yield [
                 row["Title"],
                 row["Year"],
                 row["Type"],
@@ -87,67 +601,111 @@ def write_to_db(university):
                 row["Researcher Name"],
                 row["Profile URL"],
                 row["Job Title"],
-                row["Field"]
-            ])
+                row["Field"],
+                row.get("ISSN")  # Only some scrapers provide the source ISSN
+            ]
 
-    standardize(all_data) #standardize adds the Level field at index 9
-    db = SessionLocal()
-    try:
-        for row in all_data:
+def iter_chunks(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
-            pub_title, year, type_val, journal, publication_url, name, profile_url, job_title, field, job_level = row
-            
-            # Don't add researcher if title is "Exclude"
-            if job_title == "Exclude":
-                continue
+def write_chunk(db, university, chunk):
+    """
+    Writes one chunk of standardized rows without committing.
+    Existing researchers (name, profile URL) and publications (title, researcher)
+    for the chunk are looked up in bulk, the inserts and updates are built in
+    memory and written with executemany statements.
+    Returns counts of added and updated rows.
+    """
+    rows = []
+    for row in chunk:
+        pub_title, year, type_val, journal, publication_url, name, profile_url, job_title, field, job_level, issn = row
+        # Don't add researcher if title is "Exclude"
+        if job_title == "Exclude":
+            continue
+        issn = normalize_issn(issn) or issn_from_doi(extract_doi(publication_url))
+        rows.append((pub_title, year, type_val, journal, publication_url, name, profile_url, job_title, field, job_level, issn))
 
-            # Don't add researcher if same Name and Profile URL
-            researcher = db.query(Researchers).filter_by(name=name, profile_url=profile_url).first()
-            if not researcher:
-                researcher = Researchers(name=name, university=university, job_title=job_title, profile_url=profile_url, level=job_level, field=field)
+    # Existing keys, keeping the first row when duplicates exist (as .first() did)
+    researchers = {}
+    names = list({row[5] for row in rows})
+    if names:
+        for r in db.query(Researchers.id, Researchers.name, Researchers.profile_url, Researchers.job_title, Researchers.field).filter(Researchers.name.in_(names)).order_by(Researchers.id):
+            researchers.setdefault((r.name, r.profile_url), {"id": r.id, "job_title": r.job_title, "field": r.field})
 
-                db.add(researcher)
-                db.commit()
-                db.refresh(researcher)
-            else:
-                # Update existing researcher with job title if it's not empty
-                if researcher.job_title != job_title or researcher.field != field:
-                    researcher.job_title = job_title
-                    researcher.level = job_level
-                    researcher.field = field
-                    db.commit()
-            # Don't add publication if same Title and Researcher
-            db_publication = db.query(Publications).filter_by(title=pub_title, researcher_id=researcher.id).first()
-            if not db_publication:
-                db_publication = Publications(
-                    title=pub_title,
-                    year=year,
-                    publication_type=type_val,
-                    journal_name=journal,
-                    publication_url=publication_url,
-                    researcher_id=researcher.id
-                )
-                db.add(db_publication)
-                db.commit()
-                db.refresh(db_publication)
-            # Link researcher and publication (if not already linked)
-            if db_publication not in researcher.publication:
-                researcher.publication.append(db_publication)
-                db.commit()
-    finally:
-        db.close()
-        print("Completed writing to database")
+    # Researchers first, so new publications can reference their ids
+    new_researchers = []
+    updated_researchers = {}
+    pending = []
+    for pub_title, year, type_val, journal, publication_url, name, profile_url, job_title, field, job_level, issn in rows:
+        # Don't add researcher if same Name and Profile URL
+        researcher = researchers.get((name, profile_url))
+        if researcher is None:
+            researcher = {"name": name, "university": university, "job_title": job_title, "profile_url": profile_url, "level": job_level, "field": field}
+            researchers[(name, profile_url)] = researcher
+            new_researchers.append(researcher)
+        elif researcher["job_title"] != job_title or researcher["field"] != field:
+            # Update existing researcher with job title if it's not empty
+            researcher.update(job_title=job_title, level=job_level, field=field)
+            if "id" in researcher:
+                updated_researchers[researcher["id"]] = researcher
+        pending.append((researcher, pub_title, year, type_val, journal, publication_url, issn))
+
+    db.bulk_insert_mappings(Researchers, new_researchers, return_defaults=True)
+    db.bulk_update_mappings(Researchers, [
+        {"id": r["id"], "job_title": r["job_title"], "level": r["level"], "field": r["field"]}
+        for r in updated_researchers.values()
+    ])
+
+    publications = {}
+    researcher_ids = list({researcher["id"] for researcher, *_ in pending})
+    titles = list({pub_title for _, pub_title, *_ in pending})
+    if researcher_ids:
+        for p in db.query(Publications.id, Publications.title, Publications.researcher_id, Publications.issn).filter(
+            Publications.researcher_id.in_(researcher_ids), Publications.title.in_(titles)
+        ).order_by(Publications.id):
+            publications.setdefault((p.title, p.researcher_id), {"id": p.id, "issn": p.issn})
+
+    # Don't add publication if same Title and Researcher
+    new_publications = []
+    issn_updates = {}
+    for researcher, pub_title, year, type_val, journal, publication_url, issn in pending:
+        db_publication = publications.get((pub_title, researcher["id"]))
+        if db_publication is None:
+            db_publication = {
+                "title": pub_title,
+                "year": year,
+                "publication_type": type_val,
+                "journal_name": journal,
+                "publication_url": publication_url,
+                "issn": issn,
+                "researcher_id": researcher["id"]
+            }
+            publications[(pub_title, researcher["id"])] = db_publication
+            new_publications.append(db_publication)
+        elif issn and not db_publication["issn"]:
+            db_publication["issn"] = issn
+            if "id" in db_publication:
+                issn_updates[db_publication["id"]] = issn
+    db.bulk_insert_mappings(Publications, new_publications)
+    db.bulk_update_mappings(Publications, [{"id": pub_id, "issn": issn} for pub_id, issn in issn_updates.items()])
+    return {"researchers": len(new_researchers), "publications": len(new_publications), "updated_researchers": len(updated_researchers)}
 
 # Scientia Professor = normal professor
 # Emiritus = retired
 # 
 def standardize(data):
-    # Enhanced pattern to match titles in any order (e.g., "Professor Emeritus" or "Emeritus Professor")
-    title_pattern = re.compile(
-        r"^(Dr\.?|Associate Professor|Professor|Ms\.?|Mr\.?|Mrs\.?|Lecturer|Prof\.?|EmPr|AsPr"
-        r"|Scientia Professor|Professor Scientia|Emeritus Professor|Professor Emeritus|Emeritus)\s+",
-        re.IGNORECASE
-    )
+    """
+    Cleans scraped rows in place and inserts the role level at index 9.
+    Job titles, levels and names go through app.scrapers.helpers.normalize,
+    whose patterns are compiled once and whose results are cached.
+    """
     for row in data:
         # Check required fields
         if row[0] == "" or row[2] == "" or row[5] == "" or row[6] == "":
@@ -160,83 +718,20 @@ def standardize(data):
                 row[i] = None
 
         # Remove unwanted characters from publication type for big 3 universities
-        if len(row) > 2 and row[2]:
-            type_val = row[2]
-            if type_val[-2:] == ' ›':
-                type_val = type_val[:-2]
-            row[2] = type_val
+        row[2] = clean_publication_type(row[2])
 
         # Ensure year is numeric & set to integer
         if row[1] and row[1].isnumeric():
             row[1] = int(row[1])
 
-        # Blacklist certain role keywords
-        title_blacklist = ["Education-Focused", "Education Focused", "Education Focussed", "Teaching-Focused", "Teaching Focused", "Teaching Focussed"]
-        blacklist_pattern = re.compile(r'\b(?:' + '|'.join(re.escape(term) for term in title_blacklist) + r')\b', re.IGNORECASE)
-        if row[7] and blacklist_pattern.search(row[7]):
-            row[7] = "Exclude"
-        else:
-            # Ensure role names are expected
-            # Define all possible forms and their canonical mapping
-            title_map = {
-                "Associate Lecturer": "Associate Lecturer",
-                "Lecturer (A)": "Associate Lecturer",
-                "Lecturer": "Lecturer",
-                "Fellow": "Fellow",
-                "FELLOW": "Fellow",
-                "Senior Lecturer": "Senior Lecturer",
-                "Senior Fellow": "Senior Fellow",
-                "Associate Professor": "Associate Professor",
-                "Associate Prof": "Associate Professor",
-                "AsPr": "Associate Professor",
-                "Professor": "Professor",
-                "PROFESSOR": "Professor",
-                "Prof": "Professor",
-                "Professorial Fellow": "Professorial Fellow",
-                "Professor Emeritus": "Professor Emeritus",
-                "Emeritus Professor": "Professor Emeritus",
-                "Emeritus": "Professor Emeritus"
-            }
-            # Sort by length so longer matches take priority
-            titles = sorted(title_map.keys(), key=len, reverse=True)
-            pattern = r"\b(" + "|".join(re.escape(t) for t in titles) + r")\b"
-            match = re.search(pattern, row[7], flags=re.IGNORECASE)
-            if match:
-                raw = match.group()
-                row[7] = title_map.get(raw, raw)  # map to canonical form
-            else:
-                match = re.search(pattern, row[5], flags=re.IGNORECASE)
-                if match:
-                    raw = match.group()
-                    row[7] = title_map.get(raw, raw)
-                else:
-                    row[7] = None
+        # Ensure role names are expected, using the raw name as a fallback
+        row[7] = normalize_job_title(row[7], row[5])
 
         # Clean researcher name
-        if len(row) > 5 and row[5]:
-            row[5] = title_pattern.sub("", row[5]).strip()
+        row[5] = clean_researcher_name(row[5])
 
         # Add role levels
-        role_level_map = {
-            "Associate Lecturer": "A",
-            "Lecturer": "B",
-            "Fellow": "B",
-            "Senior Lecturer": "C",
-            "Senior Fellow": "C",
-            "Associate Professor": "D",
-            "Professor": "E",
-            "Professorial Fellow": "E",
-            "Professor Emeritus": "E",
-            "Exclude": None
-        }
-        if row[7] is None:
-            role_level = None
-        else:
-            try:
-                role_level = role_level_map[row[7]]
-            except KeyError:
-                role_level = None
-        row.insert(9, role_level)
+        row.insert(9, role_level(row[7]))
 
         # TODO: standardize "Type" e.g. journal article, contribution to journal etc. --> journal article
 
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from app.scrapers.UWA_Scraper import scrape_UWA
 from app.scrapers.MU_Scraper import scrape_MU
 from app.scrapers.ANU_Scraper import scrape_ANU
@@ -7,81 +8,187 @@ from app.scrapers.UQ_Scraper import scrape_UQ
 from app.scrapers.UM_Scraper import scrape_UM
 from app.scrapers.USYD_Scraper import scrape_USYD
 from app.scrapers.helpers.util import write_to_db, match_journals
+from app.scrapers.helpers.driver_pool import close_driver_pools
+from app.scrapers.helpers.page_cache import get_page_cache, set_page_cache_mode, PageCacheMiss
+from app.scrapers.helpers.fingerprints import confirm_fingerprints
 
-def update_all(db=True, match=True, progress_callback=None):
+# Universities in the order update_all runs them, with the scraper that writes each one's temp CSV
+SCRAPERS = [
+    ("UNSW", scrape_UNSW),
+    ("UA", scrape_UA),
+    ("UQ", scrape_UQ),
+    ("UM", scrape_UM),
+    ("USYD", scrape_USYD),
+    ("UWA", scrape_UWA), # Temporarily ignored as requested due to issues
+    ("MU", scrape_MU),
+    ("ANU", scrape_ANU)
+]
+
+def store_university(university, progress_callback=None):
     """
-    Runs all university scrapers sequentially and calls a callback function 
-    to report progress after each one.
+    Writes a university's scraped CSV to the database, then stores the profile
+    fingerprints from that scrape, only once the rows they vouch for are written.
     """
-    scrapers = [
-        update_UNSW,
-        update_UA,
-        update_UQ,
-        update_UM,
-        update_USYD,
-        update_UWA, # Temporarily ignored as requested due to issues
-        update_MU,
-        update_ANU
-    ]
-    total_scrapers = len(scrapers)
-    
+    write_to_db(university, progress_callback=progress_callback)
+    confirm_fingerprints(university)
+
+def update_all(db=True, match=True, progress_callback=None, match_workers=None, scraper_workers=1, status_callback=None):
+    """
+    Runs all university scrapers and calls a callback function to report progress
+    after each one, and after each chunk written to the database.
+    match_workers sets the number of processes used for journal matching.
+    scraper_workers sets how many scrapers run at once, each borrowing its own
+    browser from the shared driver pool.
+    Database writes and matching always happen one university at a time on the
+    calling thread, so SQLite only ever has a single writer.
+    status_callback(university, status, progress) reports each university's stage
+    ("queued", "scraping", "writing", "matching", "done" or "failed") and its
+    write progress out of 100.
+    """
+    total_scrapers = len(SCRAPERS)
+
     # Handle case where no scrapers are listed
     if total_scrapers == 0 and progress_callback:
         progress_callback(100)
         return
 
-    for i, scraper_func in enumerate(scrapers):
-        try:
-            print(f"--- Running scraper: {scraper_func.__name__} ---")
-            scraper_func(db, match)
-        except Exception as e:
-            # Print error but continue to the next scraper
-            print(f"!!! Error in {scraper_func.__name__}: {e} !!!")
-        finally:
-            # This block is GUARANTEED to run, ensuring progress is always updated.
+    finished = 0
+
+    def report(university, status, progress=0):
+        if status_callback:
+            status_callback(university, status, progress)
+
+    def write_progress(university, rows_done, total_rows):
+        # Progress within this university's share of the bar, as its rows are written
+        if total_rows:
+            report(university, "writing", int(rows_done / total_rows * 100))
             if progress_callback:
-                progress = int(((i + 1) / total_scrapers) * 100)
-                progress_callback(progress)
+                progress_callback(int(((finished + rows_done / total_rows) / total_scrapers) * 100))
+
+    def store(university):
+        """Writes and matches one university's scrape output."""
+        if db:
+            report(university, "writing")
+            store_university(university, progress_callback=lambda done, total: write_progress(university, done, total))
+        if match:
+            report(university, "matching", 100)
+            match_journals(university=university, workers=match_workers)
+
+    def scrape(university, scraper_func):
+        report(university, "scraping")
+        print(f"--- Running scraper: {scraper_func.__name__} ---")
+        scraper_func()
+
+    def completed(university, error=None):
+        nonlocal finished
+        if error is not None:
+            # Print error but continue to the next scraper
+            print(f"!!! Error in {university} scraper: {error} !!!")
+            report(university, "failed")
+        else:
+            report(university, "done", 100)
+        finished += 1
+        if progress_callback:
+            progress_callback(int((finished / total_scrapers) * 100))
+
+    for university, _ in SCRAPERS:
+        report(university, "queued")
+
+    # Browsers are pooled across scrapers and only quit once the whole run is done
+    try:
+        if scraper_workers <= 1:
+            for university, scraper_func in SCRAPERS:
+                try:
+                    scrape(university, scraper_func)
+                    store(university)
+                except Exception as e:
+                    completed(university, e)
+                else:
+                    completed(university)
+            return
+
+        # Scrapers run in worker threads; each result is written here as soon as it is ready
+        with ThreadPoolExecutor(max_workers=scraper_workers, thread_name_prefix="scraper") as executor:
+            futures = {
+                executor.submit(scrape, university, scraper_func): university
+                for university, scraper_func in SCRAPERS
+            }
+            for future in as_completed(futures):
+                university = futures[future]
+                try:
+                    future.result()
+                    store(university)
+                except Exception as e:
+                    completed(university, e)
+                else:
+                    completed(university)
+    finally:
+        close_driver_pools()
+
+# Scrapers whose pages all go through the page cache, so they can be re-parsed offline
+REPLAYABLE = ("ANU", "MU", "UWA", "UA", "UQ", "USYD")
+
+def replay(universities=REPLAYABLE, db=True, match=True, match_workers=None):
+    """
+    Re-runs the scrapers' parsers from the page cache only, without touching the
+    network, then writes and matches the results as usual. Use after a parser fix.
+    """
+    previous_mode = get_page_cache().mode
+    set_page_cache_mode("replay")
+    try:
+        for university, scraper_func in SCRAPERS:
+            if university not in universities or university not in REPLAYABLE:
+                continue
+            print(f"--- Replaying scraper: {scraper_func.__name__} ---")
+            try:
+                scraper_func()
+            except PageCacheMiss as e:
+                print(f"!!! {university} needs a page that was never cached ({e}); run it live first !!!")
+                continue
+            if db: store_university(university)
+            if match: match_journals(university=university, workers=match_workers)
+    finally:
+        set_page_cache_mode(previous_mode)
 
-def update_UWA(db=True, match=True):
+def update_UWA(db=True, match=True, match_workers=None, progress_callback=None):
     scrape_UWA()
-    if db: write_to_db("UWA")
-    if match: match_journals(university="UWA")
+    if db: store_university("UWA", progress_callback=progress_callback)
+    if match: match_journals(university="UWA", workers=match_workers)
 
-def update_MU(db=True, match=True):
+def update_MU(db=True, match=True, match_workers=None, progress_callback=None):
     scrape_MU()
-    if db: write_to_db("MU")
-    if match: match_journals(university="MU")
+    if db: store_university("MU", progress_callback=progress_callback)
+    if match: match_journals(university="MU", workers=match_workers)
 
-def update_ANU(db=True, match=True):
+def update_ANU(db=True, match=True, match_workers=None, progress_callback=None):
     scrape_ANU()
-    if db: write_to_db("ANU")
-    if match: match_journals(university="ANU")
+    if db: store_university("ANU", progress_callback=progress_callback)
+    if match: match_journals(university="ANU", workers=match_workers)
 
-def update_UNSW(db=True, match=True):
+def update_UNSW(db=True, match=True, match_workers=None, progress_callback=None):
     scrape_UNSW()
-    if db: write_to_db("UNSW")
-    if match: match_journals(university="UNSW")
+    if db: store_university("UNSW", progress_callback=progress_callback)
+    if match: match_journals(university="UNSW", workers=match_workers)
 
-def update_UA(db=True, match=True):
+def update_UA(db=True, match=True, match_workers=None, progress_callback=None):
     scrape_UA()
-    if db: write_to_db("UA")
-    if match: match_journals(university="UA")
+    if db: store_university("UA", progress_callback=progress_callback)
+    if match: match_journals(university="UA", workers=match_workers)
 
-def update_UQ(db=True, match=True):
+def update_UQ(db=True, match=True, match_workers=None, progress_callback=None):
     scrape_UQ()
-    if db: write_to_db("UQ")
-    if match: match_journals(university="UQ")
+    if db: store_university("UQ", progress_callback=progress_callback)
+    if match: match_journals(university="UQ", workers=match_workers)
     
-def update_UM(db=True, match=True):
+def update_UM(db=True, match=True, match_workers=None, progress_callback=None):
     scrape_UM()
-    if db: write_to_db("UM")
-    if match: match_journals(university="UM")
+    if db: store_university("UM", progress_callback=progress_callback)
+    if match: match_journals(university="UM", workers=match_workers)
 
-def update_USYD(db=True, match=True):
+def update_USYD(db=True, match=True, match_workers=None, progress_callback=None):
     scrape_USYD()
-    if db: write_to_db("USYD")
-    if match: match_journals(university="USYD")
+    if db: store_university("USYD", progress_callback=progress_callback)
+    if match: match_journals(university="USYD", workers=match_workers)
 
 if __name__ == "__main__":
     update_UNSW()
@@ -1,12 +1,27 @@
 import pandas as pd
-from app.models import Journals
+from app.models import Journals, JournalRankings
 from app.database import SessionLocal
+from app.scrapers.helpers.util import invalidate_journal_match_cache, link_journal_rankings, update_publication_ranks
 import csv
 import os
 import fnmatch
 
 # Path to the CSV file
 CSV_PATH = "./app/files/2022 JQL.csv"
+# Every ABDC JQL edition shipped in app/files, by year of publication
+JQL_EDITIONS = {year: f"./app/files/{year} JQL.csv" for year in (2010, 2013, 2016, 2019, 2022)}
+# Column names used across JQL editions, mapped to JournalRankings columns
+JQL_COLUMNS = {
+    "Journal Name": "title",
+    "Journal Title": "title",
+    "ISSN": "ISSN",
+    "ISSN Online": "eISSN",
+    "ABDC Ranking": "abdc_rank",
+    "ABDC List 2013": "abdc_rank",
+    "rating": "abdc_rank",
+    "2019 Rating": "abdc_rank",
+    "Rating": "abdc_rank"
+}
 
 def import_journals(CSV_PATH=CSV_PATH):
     df = pd.read_csv(CSV_PATH)
@@ -15,6 +30,7 @@ def import_journals(CSV_PATH=CSV_PATH):
 
     session = SessionLocal()
     try:
+        added = []
         for _, row in df.iterrows():
             # Check if journal already exists
             existing = session.query(Journals).filter_by(name=row['Journal Title']).first()
@@ -29,10 +45,49 @@ def import_journals(CSV_PATH=CSV_PATH):
                     year_of_inception=row['Year Inception']
                 )
                 session.add(journal)
+                added.append(journal)
+        session.flush()
+        invalidate_journal_match_cache(session, added_journals=[(j.id, j.name) for j in added])
         session.commit()
     finally:
         session.close()
 
+def import_journal_rankings(editions=JQL_EDITIONS):
+    """
+    Loads every JQL edition into JournalRankings in one transaction, replacing
+    any previous load, links the entries to Journals and recomputes the rank at
+    time of publication for all publications.
+    """
+    rows = []
+    for edition, path in sorted(editions.items()):
+        df = pd.read_csv(path, dtype=str)
+        df.columns = [col.strip() for col in df.columns]
+        df = df.rename(columns=JQL_COLUMNS)[["title", "ISSN", "eISSN", "abdc_rank"]]
+        for record in df.to_dict("records"):
+            title = (record["title"] if isinstance(record["title"], str) else "").strip()
+            if not title:
+                continue
+            rank = record["abdc_rank"]
+            rows.append({
+                "edition": edition,
+                "title": title,
+                "ISSN": record["ISSN"] if isinstance(record["ISSN"], str) else None,
+                "eISSN": record["eISSN"] if isinstance(record["eISSN"], str) else None,
+                "abdc_rank": rank.strip().upper() if isinstance(rank, str) and rank.strip() else None
+            })
+        print(f"Loaded {edition} JQL from {path}")
+
+    session = SessionLocal()
+    try:
+        session.query(JournalRankings).delete()
+        session.bulk_insert_mappings(JournalRankings, rows)
+        linked = link_journal_rankings(session)
+        updated = update_publication_ranks(session)
+        session.commit()
+        print(f"Imported {len(rows)} rankings ({linked} linked to journals), updated {updated} publication ranks")
+    finally:
+        session.close()
+
 def print_issns_in_batches(batch_size=600):
     session = SessionLocal()
     output_path = "./app/files/temp/issn_batches.txt"
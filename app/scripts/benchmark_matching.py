@@ -0,0 +1,174 @@
+import argparse
+import csv
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+import numpy
+import rapidfuzz
+from sqlalchemy import create_engine
+
+from app.database import Base, SessionLocal
+from app.models import Journals, Publications, JournalMatches
+from app.scripts.CSV_imports import import_journals
+from app.scrapers.helpers.util import match_journals, write_to_db, clear_journal_trigram_index, MATCH_CANDIDATES
+
+JQL_PATH = "./app/files/2022 JQL.csv"
+# Snapshot of the scrape outputs the report was measured on; live scrapes rewrite app/files/temp
+SCRAPE_GLOB = "./app/files/benchmark/scrapes/*_data.csv"
+GOLDEN_PATH = "./app/files/benchmark/golden_journal_matches.csv"
+REPORT_PATH = "./app/files/benchmark/report.json"
+THRESHOLDS = (80, 85, 90, 95, 100)
+
+def build_fixture(db_path):
+    """
+    Builds the benchmark database from the 2022 JQL and the scrape snapshot under
+    app/files/benchmark/scrapes, in the same way the app imports them. Returns the
+    universities loaded.
+    """
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    SessionLocal.configure(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    scrapes = {os.path.basename(path)[:-len("_data.csv")]: path for path in glob.glob(SCRAPE_GLOB)}
+    universities = sorted(scrapes)
+    with redirect_stdout(io.StringIO()):
+        import_journals(JQL_PATH)
+        for university in universities:
+            write_to_db(university, csv_path=scrapes[university])
+    return universities
+
+def load_golden(path=GOLDEN_PATH):
+    """Returns {journal_name: expected ABDC title or None} from the hand-labelled golden set."""
+    with open(path, newline="", encoding="utf-8") as f:
+        return {row["journal_name"]: row["expected_journal"] or None for row in csv.DictReader(f)}
+
+def reset_matches(db):
+    """Clears everything a previous run could reuse, so the next run starts cold."""
+    db.query(Publications).update({Publications.journal_id: None})
+    db.query(JournalMatches).delete()
+    db.commit()
+    clear_journal_trigram_index()
+
+def timed_match(workers, measure_memory=False):
+    """Runs match_journals quietly and returns (stats, wall time in seconds, peak memory in bytes)."""
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        stats = match_journals(force=True, workers=workers)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if measure_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return stats, elapsed, peak
+
+def summarize_runs(runs, peak):
+    stats = runs[0][0]
+    wall_times = [round(elapsed, 3) for _, elapsed, _ in runs]
+    wall_time = statistics.median(wall_times)
+    return {
+        "wall_time_s": wall_time,
+        "wall_times_s": wall_times,
+        "names_per_s": round(stats["names"] / wall_time, 1) if wall_time else None,
+        "peak_memory_mb": round(peak / 2**20, 1),
+        "stats": stats
+    }
+
+def score_golden(db, golden):
+    """Precision/recall of the current journal_id assignments over publications in the golden set."""
+    rows = (
+        db.query(Publications.journal_name, Journals.name)
+        .outerjoin(Journals, Publications.journal_id == Journals.id)
+        .filter(Publications.journal_name.in_(list(golden)))
+        .all()
+    )
+    tp = fp = fn = 0
+    for journal_name, predicted in rows:
+        expected = golden[journal_name]
+        if predicted is not None and predicted == expected:
+            tp += 1
+            continue
+        if predicted is not None:
+            fp += 1
+        if expected is not None:
+            fn += 1
+    return {
+        "precision": round(tp / (tp + fp), 4) if tp + fp else None,
+        "recall": round(tp / (tp + fn), 4) if tp + fn else None,
+        "tp": tp,
+        "fp": fp,
+        "fn": fn
+    }
+
+def run_benchmark(workers=None, repeat=3):
+    """
+    Builds a fresh fixture in a temporary directory and benchmarks match_journals on it.
+    Cold runs start with an empty match cache, warm runs reuse the cache left by the
+    previous run. Accuracy is measured against the golden set at each threshold.
+    """
+    golden = load_golden()
+    with tempfile.TemporaryDirectory() as tmp:
+        universities = build_fixture(os.path.join(tmp, "benchmark.db"))
+        db = SessionLocal()
+        try:
+            cold = []
+            for _ in range(repeat):
+                reset_matches(db)
+                cold.append(timed_match(workers))
+            reset_matches(db)
+            cold_peak = timed_match(workers, measure_memory=True)[2]
+
+            warm = [timed_match(workers) for _ in range(repeat)]
+            warm_peak = timed_match(workers, measure_memory=True)[2]
+
+            accuracy = {}
+            for threshold in THRESHOLDS:
+                with redirect_stdout(io.StringIO()):
+                    match_journals(threshold=threshold, force=True, workers=workers)
+                accuracy[str(threshold)] = score_golden(db, golden)
+
+            fixture = {
+                "universities": universities,
+                "journals": db.query(Journals).count(),
+                "publications": db.query(Publications).count(),
+                "golden_names": len(golden),
+                "golden_publications": db.query(Publications).filter(Publications.journal_name.in_(list(golden))).count()
+            }
+        finally:
+            db.close()
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "rapidfuzz": rapidfuzz.__version__,
+            "numpy": numpy.__version__
+        },
+        "config": {"workers": workers, "repeat": repeat, "candidates": MATCH_CANDIDATES, "thresholds": list(THRESHOLDS)},
+        "fixture": fixture,
+        "cold": summarize_runs(cold, cold_peak),
+        "warm": summarize_runs(warm, warm_peak),
+        "accuracy": accuracy
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark journal matching against a frozen fixture.")
+    parser.add_argument("--workers", type=int, default=None, help="Matching worker processes")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per mode")
+    parser.add_argument("--output", default=REPORT_PATH, help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    report = run_benchmark(workers=args.workers, repeat=args.repeat)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(json.dumps(report["cold"], indent=2))
+    print(json.dumps(report["accuracy"], indent=2))
+    print(f"Report written to {args.output}")
@@ -0,0 +1,188 @@
+import argparse
+import copy
+import glob
+import io
+import platform
+import re
+import statistics
+import time
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+from app.scrapers.helpers import normalize
+from app.scrapers.helpers.util import standardize, read_scraped_rows
+
+SCRAPE_GLOB = "./app/files/temp/*_data.csv"
+
+def legacy_standardize(data):
+    """The per-row standardize() from before app.scrapers.helpers.normalize, kept as the baseline."""
+    # Enhanced pattern to match titles in any order (e.g., "Professor Emeritus" or "Emeritus Professor")
+    title_pattern = re.compile(
+        r"^(Dr\.?|Associate Professor|Professor|Ms\.?|Mr\.?|Mrs\.?|Lecturer|Prof\.?|EmPr|AsPr"
+        r"|Scientia Professor|Professor Scientia|Emeritus Professor|Professor Emeritus|Emeritus)\s+",
+        re.IGNORECASE
+    )
+    for row in data:
+        # Check required fields
+        if row[0] == "" or row[2] == "" or row[5] == "" or row[6] == "":
+            print(row)
+            raise ValueError(f"Missing required field in row: {row}")
+
+        # Ensure NULL fields are set to None
+        for i in [1, 3, 4]:
+            if row[i] == "":
+                row[i] = None
+
+        # Remove unwanted characters from publication type for big 3 universities
+        if len(row) > 2 and row[2]:
+            type_val = row[2]
+            if type_val[-2:] == ' ›':
+                type_val = type_val[:-2]
+            row[2] = type_val
+
+        # Ensure year is numeric & set to integer
+        if row[1] and row[1].isnumeric():
+            row[1] = int(row[1])
+
+        # Blacklist certain role keywords
+        title_blacklist = ["Education-Focused", "Education Focused", "Education Focussed", "Teaching-Focused", "Teaching Focused", "Teaching Focussed"]
+        blacklist_pattern = re.compile(r'\b(?:' + '|'.join(re.escape(term) for term in title_blacklist) + r')\b', re.IGNORECASE)
+        if row[7] and blacklist_pattern.search(row[7]):
+            row[7] = "Exclude"
+        else:
+            # Ensure role names are expected
+            # Define all possible forms and their canonical mapping
+            title_map = {
+                "Associate Lecturer": "Associate Lecturer",
+                "Lecturer (A)": "Associate Lecturer",
+                "Lecturer": "Lecturer",
+                "Fellow": "Fellow",
+                "FELLOW": "Fellow",
+                "Senior Lecturer": "Senior Lecturer",
+                "Senior Fellow": "Senior Fellow",
+                "Associate Professor": "Associate Professor",
+                "Associate Prof": "Associate Professor",
+                "AsPr": "Associate Professor",
+                "Professor": "Professor",
+                "PROFESSOR": "Professor",
+                "Prof": "Professor",
+                "Professorial Fellow": "Professorial Fellow",
+                "Professor Emeritus": "Professor Emeritus",
+                "Emeritus Professor": "Professor Emeritus",
+                "Emeritus": "Professor Emeritus"
+            }
+            # Sort by length so longer matches take priority
+            titles = sorted(title_map.keys(), key=len, reverse=True)
+            pattern = r"\b(" + "|".join(re.escape(t) for t in titles) + r")\b"
+            match = re.search(pattern, row[7], flags=re.IGNORECASE)
+            if match:
+                raw = match.group()
+                row[7] = title_map.get(raw, raw)  # map to canonical form
+            else:
+                match = re.search(pattern, row[5], flags=re.IGNORECASE)
+                if match:
+                    raw = match.group()
+                    row[7] = title_map.get(raw, raw)
+                else:
+                    row[7] = None
+
+        # Clean researcher name
+        if len(row) > 5 and row[5]:
+            row[5] = title_pattern.sub("", row[5]).strip()
+
+        # Add role levels
+        role_level_map = {
+            "Associate Lecturer": "A",
+            "Lecturer": "B",
+            "Fellow": "B",
+            "Senior Lecturer": "C",
+            "Senior Fellow": "C",
+            "Associate Professor": "D",
+            "Professor": "E",
+            "Professorial Fellow": "E",
+            "Professor Emeritus": "E",
+            "Exclude": None
+        }
+        if row[7] is None:
+            role_level = None
+        else:
+            try:
+                role_level = role_level_map[row[7]]
+            except KeyError:
+                role_level = None
+        row.insert(9, role_level)
+
+        # TODO: standardize "Type" e.g. journal article, contribution to journal etc. --> journal article
+
+def load_rows():
+    """Reads every checked-in scrape output, in the row layout standardize() expects."""
+    rows = []
+    for path in sorted(glob.glob(SCRAPE_GLOB)):
+        rows.extend(read_scraped_rows(path))
+    return rows
+
+def clear_caches():
+    normalize.normalize_job_title.cache_clear()
+    normalize.clean_researcher_name.cache_clear()
+
+def time_rows(func, rows, repeat, cold=True):
+    """Runs func over a fresh copy of rows repeat times and returns (median seconds, last output)."""
+    times = []
+    for _ in range(repeat):
+        data = copy.deepcopy(rows)
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            func(data)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), data
+
+def time_frame(rows, repeat):
+    """Times normalize_researcher_columns on the same rows loaded as a DataFrame."""
+    df = pd.DataFrame([row[5:8] for row in rows], columns=["Researcher Name", "Profile URL", "Job Title"])
+    times = []
+    for _ in range(repeat):
+        clear_caches()
+        start = time.perf_counter()
+        out = normalize.normalize_researcher_columns(df)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), out
+
+def run_benchmark(repeat=5):
+    rows = load_rows()
+    legacy_time, legacy = time_rows(legacy_standardize, rows, repeat)
+    cold_time, cold = time_rows(standardize, rows, repeat)
+    warm_time, warm = time_rows(standardize, rows, repeat, cold=False)
+    frame_time, frame = time_frame(rows, repeat)
+
+    # The new paths must produce exactly what the legacy one did
+    assert cold == legacy and warm == legacy, "standardize output differs from the legacy implementation"
+    expected = [(row[5], row[7], row[9]) for row in legacy]
+    frame = frame[["Researcher Name", "Job Title", "Level"]].astype(object)
+    actual = list(frame.where(frame.notna(), None).itertuples(index=False, name=None))
+    assert actual == expected, "normalize_researcher_columns output differs from the legacy implementation"
+
+    def result(seconds):
+        return {"seconds": round(seconds, 4), "rows_per_s": round(len(rows) / seconds)}
+
+    return {
+        "python": platform.python_version(),
+        "rows": len(rows),
+        "distinct_titles": len({(row[7], row[5]) for row in rows}),
+        "legacy": result(legacy_time),
+        "cold": result(cold_time),
+        "warm": result(warm_time),
+        "pandas": result(frame_time)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark scraped row normalization on the checked-in temp CSVs.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per implementation")
+    args = parser.parse_args()
+
+    report = run_benchmark(repeat=args.repeat)
+    print(f"{report['rows']} rows, {report['distinct_titles']} distinct (job title, name) pairs")
+    for key in ("legacy", "cold", "warm", "pandas"):
+        print(f"{key:>7}: {report[key]['rows_per_s']:>10} rows/s ({report[key]['seconds']}s)")
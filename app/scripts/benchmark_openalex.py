@@ -0,0 +1,185 @@
+import argparse
+import io
+import json
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+from app.scrapers.helpers.openalex import OpenAlexClient
+from app.scrapers.helpers.page_cache import PageCache
+from app.scrapers.UM_Scraper import get_works_openalex
+
+INSTITUTION = {"id": "https://openalex.org/I1", "display_name": "University of Melbourne"}
+
+def make_data(authors, works_per_author):
+    """Fake OpenAlex authors and works, including co-authored, SSRN-duplicated and sourceless works."""
+    author_list = [{"id": f"https://openalex.org/A{i}", "display_name": f"Researcher {i}"} for i in range(authors)]
+    works = []
+    for i in range(authors):
+        for j in range(works_per_author):
+            n = len(works)
+            coauthors = [author_list[i]] + ([author_list[(i + 1) % authors]] if j % 5 == 0 else [])
+            source = {"display_name": "SSRN Electronic Journal" if j % 7 == 0 else f"Journal {n % 11}", "issn_l": f"{n % 11:04d}-000X"}
+            works.append({
+                "id": f"https://openalex.org/W{n}",
+                "display_name": f"Paper {j % (works_per_author - 3)} by researcher {i}",
+                "publication_date": f"{2000 + n % 25}-01-01",
+                "type": "article",
+                "doi": f"https://doi.org/10.1/{n}",
+                "primary_location": {"source": None if j % 13 == 0 else source, "is_oa": False, "landing_page_url": f"https://example.org/{n}"},
+                "authorships": [{"author": a, "institutions": [INSTITUTION]} for a in coauthors],
+                "abstract_inverted_index": {word: [k] for k, word in enumerate(("lorem ipsum dolor sit amet " * 40).split())},
+                "referenced_works": [f"https://openalex.org/W{k}" for k in range(40)],
+                "concepts": [{"id": f"https://openalex.org/C{k}", "display_name": f"Concept {k}", "score": 0.5} for k in range(10)]
+            })
+    return author_list, works
+
+def make_handler(author_list, works, latency, counter):
+    """Serves the slice of the OpenAlex API the UM scraper uses."""
+    def select(item, fields):
+        return {key: item[key] for key in fields.split(",")} if fields else item
+
+    def page_of(results, params):
+        per_page = int(params.get("per-page", ["25"])[0])
+        cursor = params.get("cursor", [None])[0]
+        start = int(cursor) if cursor and cursor != "*" else 0
+        page = results[start:start + per_page]
+        next_cursor = str(start + per_page) if cursor and start + per_page < len(results) else None
+        fields = params.get("select", [None])[0]
+        return {"meta": {"count": len(results), "next_cursor": next_cursor}, "results": [select(item, fields) for item in page]}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            counter["requests"] += 1
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            parts = url.path.strip("/").split("/")
+            filters = dict(f.split(":", 1) for f in params.get("filter", [""])[0].split(",") if f)
+            if parts[0] == "institutions":
+                body = page_of([INSTITUTION], params)
+            elif parts[0] == "authors":
+                name = params.get("search", [""])[0]
+                body = page_of([a for a in author_list if a["display_name"] == name], params)
+            elif parts[0] == "works" and len(parts) == 2:
+                body = select(next(w for w in works if w["id"].endswith(f"/{parts[1]}")), params.get("select", [None])[0])
+            else:
+                if "author.id" in filters:
+                    wanted = {f"https://openalex.org/{a}" for a in filters["author.id"].split("|")}
+                    results = [w for w in works if any(a["author"]["id"] in wanted for a in w["authorships"])]
+                else:
+                    wanted = {f"https://openalex.org/{w}" for w in filters.get("openalex", "").split("|")}
+                    results = [w for w in works if w["id"] in wanted]
+                body = page_of(results, params)
+            data = json.dumps(body).encode("utf-8")
+            counter["bytes"] += len(data)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+def legacy_works_openalex(academics, base):
+    """
+    The previous get_works_openalex, making the same requests pyalex made for it
+    (pyalex always talks to api.openalex.org): a full paginated query per author,
+    then another request for every work it returned.
+    """
+    session = requests.Session()
+
+    def get(path, **params):
+        response = session.get(f"{base}/{path}", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    UniMelb_works = []
+    insts = get("institutions", search="University of Melbourne")["results"]
+    inst_id = insts[0]["id"].replace("https://openalex.org/", "")
+    for academic in (a for a in academics if not a["scraped"]):
+        auths = get("authors", search=academic["name"], filter=f"affiliations.institution.id:{inst_id}")["results"]
+        try:
+            auth_id = auths[0]["id"].replace("https://openalex.org/", "")
+        except IndexError:
+            continue
+        works = []
+        cursor = "*"
+        while cursor:
+            page = get("works", filter=f"author.id:{auth_id}", cursor=cursor, **{"per-page": 200})
+            works.extend(page["results"])
+            cursor = page["meta"]["next_cursor"] if page["results"] else None
+        auth_works = {}
+        for work in works:
+            this_work = get(f"works/{work['id'].replace('https://openalex.org/', '')}")
+            work_name = this_work["display_name"]
+            try:
+                work_source = this_work["primary_location"]["source"]["display_name"]
+                work_date = this_work["publication_date"][:4]
+                work_type = this_work["type"]
+                work_link = this_work["doi"]
+                work_issn = this_work["primary_location"]["source"].get("issn_l") or ""
+            except (TypeError, KeyError, ValueError):
+                continue
+            if work_name not in auth_works:
+                auth_works[work_name] = [work_name, work_date, work_type, work_source, work_link, academic["name"], academic["url"], academic["role"], academic["field"], work_issn]
+            elif auth_works[work_name][3] == "SSRN Electronic Journal":
+                auth_works[work_name][3] = work_source
+                auth_works[work_name][1] = work_date
+                auth_works[work_name][9] = work_issn
+        UniMelb_works.extend(auth_works.values())
+    return UniMelb_works
+
+def make_academics(authors):
+    academics = [
+        {"name": f"Researcher {i}", "url": f"https://findanexpert.unimelb.edu.au/profile/{i}", "role": "Lecturer", "field": "Finance", "scraped": False}
+        for i in range(authors)
+    ]
+    # Someone OpenAlex doesn't know
+    academics.append({"name": "Unknown Person", "url": "", "role": "Lecturer", "field": "Finance", "scraped": False})
+    return academics
+
+def run_benchmark(authors=40, works_per_author=30, latency=0.01):
+    author_list, works = make_data(authors, works_per_author)
+    counter = {"requests": 0, "bytes": 0}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(author_list, works, latency, counter))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # The stub needs no rate limiting
+            runs = [
+                ("legacy", lambda: legacy_works_openalex(make_academics(authors), base)),
+                ("client", lambda: get_works_openalex(make_academics(authors), OpenAlexClient(base, cache=PageCache(cache_dir, mode="refresh"), rate=1000))),
+                ("client_cached", lambda: get_works_openalex(make_academics(authors), OpenAlexClient(base, cache=PageCache(cache_dir, mode="on"), rate=1000)))
+            ]
+            for name, run in runs:
+                counter.update(requests=0, bytes=0)
+                start = time.perf_counter()
+                with redirect_stdout(io.StringIO()):
+                    rows = run()
+                results[name] = {"rows": rows, "requests": counter["requests"], "kb": round(counter["bytes"] / 1024), "s": round(time.perf_counter() - start, 3)}
+    finally:
+        server.shutdown()
+
+    assert results["client"]["rows"] == results["legacy"]["rows"], "client produced different rows"
+    assert results["client_cached"]["rows"] == results["legacy"]["rows"], "cached client produced different rows"
+    return {"rows": len(results["legacy"]["rows"]), **{name: {k: v for k, v in r.items() if k != "rows"} for name, r in results.items()}}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare OpenAlex access for the UM scraper against a local stub API.")
+    parser.add_argument("--authors", type=int, default=40)
+    parser.add_argument("--works", type=int, default=30, help="Works per author")
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds the stub takes per request")
+    args = parser.parse_args()
+    print(run_benchmark(args.authors, args.works, args.latency))
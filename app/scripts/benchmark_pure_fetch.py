@@ -0,0 +1,100 @@
+import argparse
+import io
+import threading
+import time
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from app.scrapers.helpers import big3_functions
+from app.scrapers.helpers.big3_functions import scrape_publications, scrape_profiles
+from app.scrapers.helpers.page_cache import get_page_cache, set_page_cache_mode
+
+# Pure's header and navigation, which every page carries whether or not its content rendered
+PAGE_CHROME = "<header>" + "Research portal navigation " * 20 + "</header>"
+
+def publication_html(profile, index):
+    return (
+        '<div class="rendering rendering_researchoutput_portal-short">'
+        f'<h3 class="title"><a href="/en/publications/{profile}-{index}"><span>Paper {index} by {profile}</span></a></h3>'
+        f'<span class="date">1 Jan {2000 + index % 25}</span>'
+        '<span class="type_classification_parent">Contribution to journal ›</span>'
+        f'<span class="journal"><a href="/en/journals/j{index % 7}"><span>Journal {index % 7}.</span></a></span>'
+        '</div>'
+    )
+
+def make_handler(publications, page_size, latency):
+    """Serves fake Pure profile and publications pages, each after latency seconds."""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            url = urlparse(self.path)
+            parts = url.path.strip("/").split("/")
+            profile = parts[2] if len(parts) > 2 else ""
+            if len(parts) == 4 and parts[3] == "publications":
+                page = int(parse_qs(url.query).get("page", ["0"])[0])
+                start = page * page_size
+                items = "".join(publication_html(profile, i) for i in range(start, min(start + page_size, publications)))
+                # Past the last page the portal says so; without it the fetcher would need the browser
+                items = items or '<p class="empty-results">No results found</p>'
+                body = f"<html><body>{PAGE_CHROME}{items}</body></html>"
+            else:
+                body = f'<html><body>{PAGE_CHROME}<div class="header person-details"><span class="job-title">Senior Lecturer</span></div></body></html>'
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+def run_benchmark(profiles=20, publications=45, page_size=20, latency=0.05, per_host=4):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(publications, page_size, latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    pairs = [(f"{base}/en/persons/researcher-{i}", "Finance") for i in range(profiles)]
+    # The stub server needs no politeness, and a page that needs the browser is a bug here
+    big3_functions.POLITE_DELAY = 0
+    driver = None
+    # Both passes must really fetch: with the page cache on, the second pass would be served
+    # from disk, and the stub pages would end up in the scrapers' cache
+    previous_mode = get_page_cache().mode
+    set_page_cache_mode("off")
+    try:
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            sequential = [(url, field, *scrape_publications(url, driver)) for url, field in pairs]
+        sequential_time = time.perf_counter() - start
+
+        concurrent = []
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            scrape_profiles(pairs, driver, lambda *row: concurrent.append(row), per_host=per_host)
+        concurrent_time = time.perf_counter() - start
+    finally:
+        set_page_cache_mode(previous_mode)
+        server.shutdown()
+
+    assert concurrent == sequential, "concurrent fetch produced different rows"
+    return {
+        "profiles": profiles,
+        "rows": sum(len(row[4]) for row in sequential),
+        "sequential_s": round(sequential_time, 3),
+        "concurrent_s": round(concurrent_time, 3),
+        "speedup": round(sequential_time / concurrent_time, 1)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Pure profile fetching against a local stub portal.")
+    parser.add_argument("--profiles", type=int, default=20)
+    parser.add_argument("--publications", type=int, default=45, help="Publications per profile")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the stub takes per page")
+    parser.add_argument("--per-host", type=int, default=4, help="Concurrent requests to the portal")
+    args = parser.parse_args()
+    print(run_benchmark(args.profiles, args.publications, args.page_size, args.latency, args.per_host))
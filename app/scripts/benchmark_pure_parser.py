@@ -0,0 +1,232 @@
+import argparse
+import copy
+import time
+from urllib.parse import urljoin
+
+import lxml.html
+from selenium.webdriver.common.by import By
+
+from app.scrapers.helpers.big3_functions import (
+    parse_profile_links, parse_job_title, parse_publications, needs_browser,
+    PROFILE_LINK_CSS, PROFILE_HEADER_CSS, PUBLICATION_CSS, EMPTY_RESULTS_CSS
+)
+
+FIXTURE_DIR = "app/files/benchmark/pure"
+# Per portal: (base, listing page URL, profile URL) the fixtures were saved from
+PORTALS = {
+    "MU": (
+        "https://research.monash.edu",
+        "https://research.monash.edu/en/organisations/banking-finance/persons/?page=0",
+        "https://research.monash.edu/en/persons/viet-nga-cao"
+    ),
+    "ANU": (
+        "https://researchportalplus.anu.edu.au",
+        "https://researchportalplus.anu.edu.au/en/organisations/research-school-of-accounting/persons/?page=0",
+        "https://researchportalplus.anu.edu.au/en/persons/mark-wilson"
+    ),
+    "UWA": (
+        "https://research-repository.uwa.edu.au",
+        "https://www.uwa.edu.au/schools/business/accounting-and-finance?page=0",
+        "https://research-repository.uwa.edu.au/en/persons/millicent-chang"
+    )
+}
+
+# The CSS selectors the old Selenium extraction passed to WebDriver, as XPath relative to the element searched from
+CSS_TO_XPATH = {
+    "span.job-title": "//span[contains(concat(' ', normalize-space(@class), ' '), ' job-title ')]",
+    "div.header.person-details > div.rendering_person_persontitlerendererportal > p": (
+        "//div[contains(concat(' ', normalize-space(@class), ' '), ' header ')"
+        " and contains(concat(' ', normalize-space(@class), ' '), ' person-details ')]"
+        "/div[contains(concat(' ', normalize-space(@class), ' '), ' rendering_person_persontitlerendererportal ')]/p"
+    ),
+    "div.rendering_researchoutput_portal-short": "//div[contains(concat(' ', normalize-space(@class), ' '), ' rendering_researchoutput_portal-short ')]",
+    "h3.title a": ".//h3[contains(concat(' ', normalize-space(@class), ' '), ' title ')]//a",
+    "span": ".//span",
+    "span.date": ".//span[contains(concat(' ', normalize-space(@class), ' '), ' date ')]",
+    "span.type_classification_parent": ".//span[contains(concat(' ', normalize-space(@class), ' '), ' type_classification_parent ')]",
+    "span.journal a span": ".//span[contains(concat(' ', normalize-space(@class), ' '), ' journal ')]//a//span"
+}
+
+class FakeElement:
+    """
+    Stands in for a Selenium WebElement over a parsed fixture. Every call is one
+    WebDriver round trip, so it is counted and delayed by the driver's latency.
+    Rendered text is approximated by collapsing whitespace, as the lxml parsers do.
+    """
+    def __init__(self, node, driver):
+        self.node = node
+        self.driver = driver
+
+    @property
+    def text(self):
+        self.driver.round_trip()
+        return " ".join(self.node.text_content().split())
+
+    def get_attribute(self, name):
+        self.driver.round_trip()
+        value = self.node.get(name)
+        # Browsers return href as a resolved, absolute URL
+        return urljoin(self.driver.url, value.strip()) if name == "href" and value is not None else value
+
+    def find_elements(self, by, selector):
+        self.driver.round_trip()
+        xpath = ".//" + selector if by == By.TAG_NAME else CSS_TO_XPATH[selector]
+        return [FakeElement(node, self.driver) for node in self.node.xpath(xpath)]
+
+    def find_element(self, by, selector):
+        elements = self.find_elements(by, selector)
+        if not elements:
+            raise LookupError(f"no element matches {selector}")
+        return elements[0]
+
+class FakeDriver(FakeElement):
+    """A WebDriver whose current page is a fixture."""
+    def __init__(self, html, url, latency):
+        self.html = html
+        self.url = url
+        self.latency = latency
+        self.calls = 0
+        super().__init__(lxml.html.fromstring(html), self)
+
+    def round_trip(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def page_source(self):
+        self.round_trip()
+        return self.html
+
+def legacy_profile_links(driver, base):
+    """The element-by-element link scan find_profile_urls did before it read page source, kept as the baseline."""
+    links = []
+    for a in driver.find_elements(By.TAG_NAME, "a"):
+        href = a.get_attribute("href")
+        if href and href.startswith(f"{base}/en/persons/") and href not in links:
+            links.append(href)
+    return links
+
+def legacy_job_title(driver):
+    """The job title extraction scrape_publications did through WebDriver, kept as the baseline."""
+    try:
+        titles = [e.text.strip() for e in driver.find_elements(By.CSS_SELECTOR, "span.job-title") if e.text.strip()]
+        job_title = " ".join(dict.fromkeys(titles)) if titles else ""
+        if job_title == "":
+            try:
+                job_title = driver.find_element(
+                    By.CSS_SELECTOR, "div.header.person-details > div.rendering_person_persontitlerendererportal > p"
+                ).text.strip()
+            except Exception:
+                job_title = ""
+    except Exception:
+        job_title = ""
+    return job_title
+
+def legacy_publications(driver):
+    """The publication extraction scrape_publications did through WebDriver, kept as the baseline."""
+    publications_info = []
+    for div in driver.find_elements(By.CSS_SELECTOR, "div.rendering_researchoutput_portal-short"):
+        try:
+            a_tag = div.find_element(By.CSS_SELECTOR, "h3.title a")
+            pub_title = a_tag.find_element(By.CSS_SELECTOR, "span").text.strip()
+            publication_url = a_tag.get_attribute("href")
+        except Exception:
+            pub_title = ""
+            publication_url = ""
+        try:
+            year = div.find_element(By.CSS_SELECTOR, "span.date").text.strip()[-4:]
+        except Exception:
+            year = ""
+        try:
+            type_val = div.find_element(By.CSS_SELECTOR, "span.type_classification_parent").text.strip()
+            if type_val[-2:] == ' ›':
+                type_val = type_val[:-2]
+        except Exception:
+            type_val = ""
+        try:
+            if "Contribution to journal" in type_val:
+                journal = div.find_element(By.CSS_SELECTOR, "span.journal a span").text.strip()[:-1]
+            else:
+                journal = ""
+        except Exception:
+            journal = ""
+        publications_info.append([pub_title, year, type_val, journal, publication_url])
+    return publications_info
+
+def read_fixture(portal, page):
+    with open(f"{FIXTURE_DIR}/{portal.lower()}_{page}.html", encoding="utf-8") as f:
+        return f.read()
+
+def without_content(html):
+    """The page as a script shell would serve it: header and navigation, but nothing rendered in <main>."""
+    doc = lxml.html.fromstring(html)
+    for main in doc.xpath("//main"):
+        main.clear()
+    return lxml.html.tostring(doc, encoding="unicode")
+
+def scale_publications(html, copies):
+    """Repeats every research output on a publications page `copies` times."""
+    doc = lxml.html.fromstring(html)
+    for ul in doc.xpath("//ul[contains(@class, 'list-results')]"):
+        items = list(ul)
+        for _ in range(copies - 1):
+            for li in items:
+                ul.append(copy.deepcopy(li))
+    return lxml.html.tostring(doc, encoding="unicode")
+
+def check_portal(portal, copies, latency):
+    """Asserts the lxml parsers match the old WebDriver extraction on one portal's fixtures, and times both."""
+    base, listing_url, profile_url = PORTALS[portal]
+    publications_url = f"{profile_url}/publications/"
+    pages = {
+        "listing": (read_fixture(portal, "listing"), listing_url, PROFILE_LINK_CSS),
+        "profile": (read_fixture(portal, "profile"), profile_url, PROFILE_HEADER_CSS),
+        "publications": (scale_publications(read_fixture(portal, "publications"), copies), publications_url, PUBLICATION_CSS)
+    }
+    # The HTTP path must take rendered pages and send script shells of them to the browser
+    for page, (html, _, ready_css) in pages.items():
+        assert not needs_browser(html, ready_css, EMPTY_RESULTS_CSS), f"{portal} {page} page was sent to the browser"
+        assert needs_browser(without_content(html), ready_css, EMPTY_RESULTS_CSS), f"{portal} {page} shell was accepted over HTTP"
+
+    legacy = {
+        "listing": lambda driver: legacy_profile_links(driver, base),
+        "profile": legacy_job_title,
+        "publications": legacy_publications
+    }
+    parsers = {
+        "listing": lambda html, url: parse_profile_links(html, url, base),
+        "profile": lambda html, url: parse_job_title(html),
+        "publications": parse_publications
+    }
+    result = {"legacy_round_trips": 0, "lxml_round_trips": 0, "legacy_s": 0.0, "lxml_s": 0.0}
+    for page, (html, url, _) in pages.items():
+        driver = FakeDriver(html, url, latency)
+        start = time.perf_counter()
+        expected = legacy[page](driver)
+        result["legacy_s"] += time.perf_counter() - start
+        result["legacy_round_trips"] += driver.calls
+
+        driver = FakeDriver(html, url, latency)
+        start = time.perf_counter()
+        parsed = parsers[page](driver.page_source, url)
+        result["lxml_s"] += time.perf_counter() - start
+        result["lxml_round_trips"] += driver.calls
+
+        assert parsed == expected, f"{portal} {page}: lxml parser produced {parsed!r}, WebDriver extraction {expected!r}"
+        result[page] = len(parsed) if isinstance(parsed, list) else parsed
+    result["legacy_s"] = round(result["legacy_s"], 3)
+    result["lxml_s"] = round(result["lxml_s"], 3)
+    return result
+
+def run_benchmark(copies=20, latency=0.002, portals=tuple(PORTALS)):
+    return {portal: check_portal(portal, copies, latency) for portal in portals}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the Pure (ANU, MU, UWA) lxml parsers against the old WebDriver extraction on saved pages, and time both.")
+    parser.add_argument("--copies", type=int, default=20, help="Times each fixture publication is repeated")
+    parser.add_argument("--latency", type=float, default=0.002, help="Seconds per simulated WebDriver round trip")
+    parser.add_argument("--portal", action="append", choices=list(PORTALS), help="Only check these portals")
+    args = parser.parse_args()
+    for portal, result in run_benchmark(args.copies, args.latency, tuple(args.portal or PORTALS)).items():
+        print(portal, result)
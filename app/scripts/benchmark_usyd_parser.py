@@ -0,0 +1,196 @@
+import argparse
+import copy
+import re
+import time
+from urllib.parse import urljoin
+
+import lxml.html
+from selenium.webdriver.common.by import By
+
+from app.scrapers.USYD_Scraper import clean_spaces, text_after_year, is_empty_title, node_text, parse_profile_html
+
+FIXTURE = "app/files/benchmark/usyd_profile.html"
+PROFILE_URL = "https://www.sydney.edu.au/business/about/our-people/academic-staff/jane-citizen.html"
+
+# The CSS selectors the old parser passed to WebDriver, as XPath relative to the element searched from
+CSS_TO_XPATH = {
+    "#home ul.pubType li": "//*[@id='home']//ul[contains(concat(' ', normalize-space(@class), ' '), ' pubType ')]//li",
+    "a[href]": ".//a[@href]",
+    "em, i, cite": ".//em | .//i | .//cite"
+}
+
+class FakeElement:
+    """
+    Stands in for a Selenium WebElement over a parsed fixture. Every call is one
+    WebDriver round trip, so it is counted and delayed by the driver's latency.
+    Rendered text is approximated with node_text, the same way the lxml parser reads it.
+    """
+    def __init__(self, node, driver):
+        self.node = node
+        self.driver = driver
+
+    @property
+    def text(self):
+        self.driver.round_trip()
+        return node_text(self.node)
+
+    def get_attribute(self, name):
+        self.driver.round_trip()
+        value = self.node.get(name)
+        # Browsers return href as a resolved, absolute URL
+        return urljoin(self.driver.url, value.strip()) if name == "href" and value is not None else value
+
+    def find_elements(self, by, selector):
+        self.driver.round_trip()
+        xpath = selector if by == By.XPATH else CSS_TO_XPATH[selector]
+        return [FakeElement(node, self.driver) for node in self.node.xpath(xpath)]
+
+    def find_element(self, by, selector):
+        elements = self.find_elements(by, selector)
+        if not elements:
+            raise LookupError(f"no element matches {selector}")
+        return elements[0]
+
+class FakeDriver(FakeElement):
+    """A WebDriver whose current page is a fixture."""
+    def __init__(self, html, url, latency):
+        self.html = html
+        self.url = url
+        self.latency = latency
+        self.calls = 0
+        super().__init__(lxml.html.fromstring(html), self)
+
+    def round_trip(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def page_source(self):
+        self.round_trip()
+        return self.html
+
+def legacy_parse_items(driver, researcher_name, profile_url, researcher_role, field):
+    """The element-by-element extraction parse_profile did before it read page_source, kept as the baseline."""
+    items = driver.find_elements(By.CSS_SELECTOR, "#home ul.pubType li")
+
+    results = []
+
+    for li in items:
+        raw_text = clean_spaces(li.text)
+
+        # pub_type (section heading)
+        try:
+            pub_type = clean_spaces(li.find_element(
+                By.XPATH, "ancestor::tr[1]//p/strong"
+            ).text)
+        except Exception:
+            try:
+                pub_type = clean_spaces(li.find_element(
+                    By.XPATH, "preceding::p[strong][1]/strong"
+                ).text)
+            except Exception:
+                pub_type = ""
+
+        # Year
+        m_year = re.search(r"\b(19|20)\d{2}\b", raw_text)
+        year = m_year.group(0) if m_year else ""
+
+        # DOI / URL
+        article_url = ""
+        for a in li.find_elements(By.CSS_SELECTOR, "a[href]"):
+            href = (a.get_attribute("href") or "").strip()
+            if "doi.org" in href:
+                article_url = href
+                break
+        if not article_url:
+            # fallback: any external link that isn't on sydney.edu.au
+            for a in li.find_elements(By.CSS_SELECTOR, "a[href]"):
+                href = (a.get_attribute("href") or "").strip()
+                if href and "sydney.edu.au" not in href:
+                    article_url = href
+                    break
+
+        # emphasis candidates: title/journal/book often italicized
+        em_els = li.find_elements(By.CSS_SELECTOR, "em, i, cite")
+        em_texts = [clean_spaces(e.text) for e in em_els if clean_spaces(e.text)]
+        first_em = em_texts[0] if em_texts else ""
+        last_em  = em_texts[-1] if em_texts else ""
+
+        # looser journal detection
+        pt = (pub_type or "").lower()
+        looks_like_journal = (
+            ("journal" in pt) or
+            bool(re.search(r"\bjournal\b", raw_text, re.I)) or
+            bool(re.search(r"\bvol\.|\bvolume\b|\bissue\b|\d+\s*\(\d+\)", raw_text, re.I))
+        )
+
+        # title: prefer text before FIRST <em>; if empty, use FIRST <em>
+        if first_em and first_em in raw_text:
+            title_part = raw_text.split(first_em, 1)[0]
+            title = clean_spaces(re.sub(r"\s*,\s*$", "", text_after_year(title_part)))
+        else:
+            title = text_after_year(raw_text)
+        title = re.sub(r"\[\s*More Information\s*\]$", "", title).rstrip(" .")
+
+        if is_empty_title(title) and first_em:
+            # common case: the title itself is italicized
+            title = first_em
+
+        # journal name: prefer LAST <em> when it looks like a journal
+        if looks_like_journal:
+            journal_name = last_em or first_em
+            if not journal_name:
+                # tiny fallback: text right after the year up to the next comma/period
+                m_j = re.search(r"\)\.\s*([^.,]+?)(?:,|\.)", raw_text)
+                journal_name = clean_spaces(m_j.group(1)) if m_j else ""
+        else:
+            journal_name = ""
+
+        results.append([title, year, pub_type, journal_name, article_url, researcher_name, profile_url, researcher_role, field])
+
+    return results
+
+def scale_fixture(html, copies):
+    """Repeats every publication list in the fixture `copies` times, for a profile with hundreds of publications."""
+    doc = lxml.html.fromstring(html)
+    for ul in doc.xpath("//ul[contains(@class, 'pubType')]"):
+        items = list(ul)
+        for _ in range(copies - 1):
+            for li in items:
+                ul.append(copy.deepcopy(li))
+    return lxml.html.tostring(doc, encoding="unicode")
+
+def run_benchmark(copies=30, latency=0.002, fixture=FIXTURE):
+    with open(fixture, encoding="utf-8") as f:
+        html = scale_fixture(f.read(), copies)
+    args = ("Jane Citizen", PROFILE_URL, "Associate Professor", "Finance")
+
+    driver = FakeDriver(html, PROFILE_URL, latency)
+    start = time.perf_counter()
+    legacy_rows = legacy_parse_items(driver, *args)
+    legacy_time = time.perf_counter() - start
+    legacy_calls = driver.calls
+
+    driver = FakeDriver(html, PROFILE_URL, latency)
+    start = time.perf_counter()
+    rows = parse_profile_html(driver.page_source, *args)
+    lxml_time = time.perf_counter() - start
+
+    assert rows == legacy_rows, "lxml parser produced different rows"
+    return {
+        "publications": len(rows),
+        "legacy_round_trips": legacy_calls,
+        "lxml_round_trips": driver.calls,
+        "legacy_s": round(legacy_time, 3),
+        "lxml_s": round(lxml_time, 3),
+        "speedup": round(legacy_time / lxml_time, 1)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the USYD lxml profile parser against the old WebDriver parser on a fixture, and time both.")
+    parser.add_argument("--copies", type=int, default=30, help="Times each fixture publication is repeated")
+    parser.add_argument("--latency", type=float, default=0.002, help="Seconds per simulated WebDriver round trip")
+    parser.add_argument("--fixture", default=FIXTURE)
+    args = parser.parse_args()
+    print(run_benchmark(args.copies, args.latency, args.fixture))